@@ -150,7 +150,7 @@ class DDeviceData:
 ###############################################################################
 
 
-@dataclass
+@dataclass(slots=True)
 class DDeviceChannelFuncData:
     """A NxScope channel function data."""
 
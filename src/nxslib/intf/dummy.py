@@ -3,7 +3,6 @@
 import math
 import queue
 import random
-import time
 from threading import Event, Lock
 
 from nxslib.dev import (
@@ -25,6 +24,17 @@ from nxslib.thread import ThreadCommon
 # Dummy nxslib device
 ###############################################################################
 
+# 3-phase sine samples for one period, computed once
+_SINE3_PERIOD = 500
+_SINE3_TABLE = tuple(
+    (
+        math.sin(x),
+        math.sin(x + (2 * math.pi / 3)),
+        math.sin(x + (4 * math.pi / 3)),
+    )
+    for x in (2 * math.pi * i / _SINE3_PERIOD for i in range(_SINE3_PERIOD))
+)
+
 
 class ChannelFunc0(IDeviceChannelFunc):
     """Generate random data for channel."""
@@ -178,14 +188,9 @@ class ChannelFunc9(IDeviceChannelFunc):
 
     def get(self, _: int) -> DDeviceChannelFuncData:
         """Get sample data."""
-        x = 2 * math.pi * self._cntr / 500
-        data = (
-            math.sin(x),
-            math.sin(x + (2 * math.pi / 3)),
-            math.sin(x + (4 * math.pi / 3)),
-        )
+        data = _SINE3_TABLE[self._cntr]
         self._cntr += 1
-        self._cntr %= 500
+        self._cntr %= _SINE3_PERIOD
 
         return DDeviceChannelFuncData(data=data)
 
@@ -304,7 +309,7 @@ class DummyDev(ICommInterface):
         """
         super().__init__()
         self._thrd_stream = ThreadCommon(
-            self._thread_stream, name="dummy_stream"
+            self._thread_stream, name="dummy_stream", idle_period=stream_sleep
         )
         self._thrd_recv = ThreadCommon(self._thread_recv, name="dummy_recv")
 
@@ -316,12 +321,12 @@ class DummyDev(ICommInterface):
 
         self._dummydev = Device(chmax, flags, rxpadding, channels)
         self._dummydev_lock = Lock()
-        self._stream_sleep = stream_sleep
         self._stream_snum = stream_snum
         self._qwrite: queue.Queue[bytes] = queue.Queue()
         self._qread: queue.Queue[bytes] = queue.Queue()
 
         self._stream_started = Event()
+        self._stopping = False
 
         self._parse: ParseRecv | None = None
 
@@ -395,33 +400,38 @@ class DummyDev(ICommInterface):
         samples = []
 
         with self._dummydev_lock:
+            # channels state can't change while we hold the lock,
+            # so resolve enabled channels once for all samples
+            enabled = []
+            for chid in range(self._dummydev.data.chmax):
+                chan = self._dummydev.channel_get(chid)
+                assert chan
+                if chan.data.en is True:
+                    enabled.append((chid, chan))
+
             for _ in range(snum):
-                for chid in range(self._dummydev.data.chmax):
-                    chan = self._dummydev.channel_get(chid)
-                    assert chan
-
-                    if chan.data.en is True:
-                        data = chan.data_get()
-                        if data:
-                            sample = DParseStreamData(
-                                chan=chid,
-                                dtype=chan.data.dtype,
-                                vdim=chan.data.vdim,
-                                mlen=chan.data.mlen,
-                                data=data.data,
-                                meta=data.meta,
-                            )
-                            samples.append(sample)
+                for chid, chan in enabled:
+                    data = chan.data_get()
+                    if data:
+                        chdata = chan.data
+                        sample = DParseStreamData(
+                            chan=chid,
+                            dtype=chdata.dtype,
+                            vdim=chdata.vdim,
+                            mlen=chdata.mlen,
+                            data=data.data,
+                            meta=data.meta,
+                        )
+                        samples.append(sample)
         return samples
 
     def _thread_stream(self) -> None:
         assert self._parse
-        if self._stream_started.wait(timeout=1.0):
+        if self._stream_started.wait(timeout=1.0) and not self._stopping:
             samples = self._stream_data_get(self._stream_snum)
             frame = self._parse.frame_stream_encode(samples)
             if frame is not None:  # pragma: no cover
                 self._qread.put(frame)
-            time.sleep(self._stream_sleep)
 
     def _thread_recv(self) -> None:
         assert self._parse
@@ -434,15 +444,27 @@ class DummyDev(ICommInterface):
         except queue.Empty:
             pass
 
-        if data is not None:
-            self._parse.recv_handle(data)
+        if data:
+            self._parse.recv_feed(data)
 
     def stop(self) -> None:
         """Stop the interface."""
         logger.debug("Stop dummy interface")
+
+        # wake threads blocked on the stream event and the write queue,
+        # otherwise stop waits for their timeouts
+        self._stopping = True
+        self._thrd_stream.stop_set()
+        self._thrd_recv.stop_set()
+        self._stream_started.set()
+        self._qwrite.put(b"")
+
         self._thrd_stream.thread_stop()
         self._thrd_recv.thread_stop()
 
+        self._stream_started.clear()
+        self._stopping = False
+
         # get all pending data from queues
         try:
             _ = self._qwrite.get_nowait()
@@ -485,7 +507,9 @@ class DummyDev(ICommInterface):
         """Interface specific read method."""
         data = b""
         try:
-            data = self._qread.get(block=True, timeout=1)
+            # short timeout, the caller's recv thread is stopped
+            # before the interface and waits for this read to return
+            data = self._qread.get(block=True, timeout=0.1)
         except queue.Empty:
             pass
 
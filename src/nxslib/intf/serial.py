@@ -63,19 +63,30 @@ class SerialDevice(ICommInterface):
         """Drop all frames."""
         cntr = 4
         while cntr > 0:
-            ret = self._read()
+            ret = self._read_pending(block=False)
             if not ret:  # pragma: no cover
                 cntr -= 1
 
-    def _read(self) -> bytes:
-        """Interface specific read method."""
+    def _read_pending(self, block: bool) -> bytes:
+        """Read all pending bytes.
+
+        :param block: wait for at least one byte if nothing is pending
+        """
         assert self._ser
         try:
-            return self._ser.read(self._ser.in_waiting)  # type: ignore
+            size = self._ser.in_waiting
+            if block and not size:
+                # wait for data instead of polling an empty port
+                size = 1
+            return self._ser.read(size)  # type: ignore
         except serial.SerialException as exc:
             logger.debug("SerialException ignored: %s", str(exc))
             return b""
 
+    def _read(self) -> bytes:
+        """Interface specific read method."""
+        return self._read_pending(block=True)
+
     def _write(self, data: bytes) -> None:
         """Interface specific write method.
 
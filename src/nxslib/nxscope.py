@@ -20,7 +20,7 @@ if TYPE_CHECKING:
 ###############################################################################
 
 
-@dataclass
+@dataclass(slots=True)
 class DNxscopeStream:
     """Stream data item."""
 
@@ -36,6 +36,12 @@ class DNxscopeStream:
         return str(self.data) + ", " + str(self.meta)
 
 
+# subscriber queue, bounded subscribers use queue.Queue
+_SubQueue = (
+    queue.SimpleQueue[list[DNxscopeStream]] | queue.Queue[list[DNxscopeStream]]
+)
+
+
 ###############################################################################
 # Class: NxscopeHandler
 ###############################################################################
@@ -51,9 +57,12 @@ class NxscopeHandler:
 
         self._thrd = ThreadCommon(self._stream_thread, name="stream")
 
-        self._sub_q: list[list[queue.Queue[list[DNxscopeStream]]]] = []
+        self._sub_q: list[list[_SubQueue]] = []
         self._queue_lock: Lock = Lock()
 
+        # samples grouped by channel, only for channels with data
+        self._samples: dict[int, list[DNxscopeStream]] = {}
+
         self._stream_started: bool = False
 
         self._ovf_cntr: int = 0
@@ -80,39 +89,56 @@ class NxscopeHandler:
 
         return ret.state
 
+    @staticmethod
+    def _sub_put(que: _SubQueue, chsamples: list[DNxscopeStream]) -> None:
+        """Send samples to a subscriber queue."""
+        try:
+            que.put_nowait(chsamples)
+        except queue.Full:
+            # bounded subscriber lags behind, drop the oldest data,
+            # only we put so there is room after that
+            try:
+                que.get_nowait()
+            except queue.Empty:  # pragma: no cover
+                pass
+            que.put_nowait(chsamples)
+
     def _stream_thread(self) -> None:
         """Stream thread."""
-        assert self.dev
-        chmax = self.dev.data.chmax
-
-        samples: list[list[DNxscopeStream]]
-        samples = [[] for _ in range(chmax)]
+        # reuse samples buffer between ticks
+        samples = self._samples
 
         # get stream data
         sdata = self._comm.stream_data()
         if sdata:
-            if (
-                self._comm.flags_is_overflow(sdata.flags) is True
-            ):  # pragma: no cover
+            if self._comm.flags_is_overflow(sdata.flags):  # pragma: no cover
                 logger.info("stream flags: OVERFLOW!")
                 self._ovf_cntr += 1
 
+            # snapshot channels state once per frame, not per sample
+            assert self.dev
+            enabled = self.dev.channels_en
+            sub_q = self._sub_q
+
             for data in sdata.samples:
-                # channel enabled
-                if (
-                    self._comm.ch_is_enabled(data.chan) is True
-                ):  # pragma: no cover
-                    samples[data.chan].append(
-                        DNxscopeStream(data.data, data.meta)
-                    )
-
-            with self._queue_lock:
-                # send all samples at once
-                for data.chan in range(chmax):
-                    if len(samples[data.chan]) > 0:
-                        # send for all subscribers
-                        for que in self._sub_q[data.chan]:
-                            que.put(samples[data.chan])
+                chan = data.chan
+                # channel enabled and subscribed
+                if sub_q[chan] and enabled[chan]:  # pragma: no cover
+                    # setdefault() would build a throwaway list per sample
+                    chsamples = samples.get(chan)
+                    if chsamples is None:
+                        chsamples = samples[chan] = []
+                    chsamples.append(DNxscopeStream(data.data, data.meta))
+
+            # subscriber lists are replaced, never modified in place,
+            # so they can be walked here without the queue lock
+            for chan, chsamples in samples.items():
+                # send for all subscribers
+                for que in sub_q[chan]:
+                    self._sub_put(que, chsamples)
+
+            # sample lists are owned by subscribers now
+            samples.clear()
 
     def _reset_stats(self) -> None:
         self._ovf_cntr = 0
@@ -186,19 +212,25 @@ class NxscopeHandler:
 
             self._stream_started = False
 
-    def stream_sub(self, chan: int) -> queue.Queue[list[DNxscopeStream]]:
+    def stream_sub(self, chan: int, maxsize: int = 0) -> _SubQueue:
         """Subscribe to a given channel.
 
         :param chid: the channel ID
+        :param maxsize: if greater than zero, the queue holds at most
+          maxsize items and the oldest data is dropped when it is full
         """
-        subq: queue.Queue[list[DNxscopeStream]] = queue.Queue()
+        subq: _SubQueue
+        if maxsize > 0:
+            subq = queue.Queue(maxsize)
+        else:
+            subq = queue.SimpleQueue()
 
         with self._queue_lock:
-            self._sub_q[chan].append(subq)
+            self._sub_q[chan] = [*self._sub_q[chan], subq]
 
         return subq
 
-    def stream_unsub(self, subq: queue.Queue[list[DNxscopeStream]]) -> None:
+    def stream_unsub(self, subq: _SubQueue) -> None:
         """Unsubscribe from a given channel.
 
         :param subq: the queue instance that was used with the channel
@@ -206,7 +238,7 @@ class NxscopeHandler:
         with self._queue_lock:
             for i, sub in enumerate(self._sub_q):
                 if subq in sub:
-                    self._sub_q[i].remove(subq)
+                    self._sub_q[i] = [q for q in sub if q is not subq]
 
     def channels_default_cfg(self, writenow: bool = False) -> None:
         """Set default channels configuration.
@@ -48,7 +48,7 @@ class EParseError(IntEnum):
 ###############################################################################
 
 
-@dataclass
+@dataclass(slots=True)
 class DParseHdr:
     """Nxslib frame header data."""
 
@@ -62,7 +62,7 @@ class DParseHdr:
 ###############################################################################
 
 
-@dataclass
+@dataclass(slots=True)
 class DParseFrame:
     """Nxslib frame data."""
 
@@ -90,21 +90,25 @@ class ICommFrame(ABC):
         """Get the size of a footer."""
 
     @abstractmethod
-    def hdr_find(self, data: bytes) -> int:
+    def hdr_find(
+        self, data: bytes | bytearray, start: int = 0, end: int | None = None
+    ) -> int:
         """Find a header in bytes.
 
         :param data: bytes to search
+        :param start: search start index
+        :param end: search end index
         """
 
     @abstractmethod
-    def hdr_decode(self, data: bytes) -> DParseHdr:
+    def hdr_decode(self, data: bytes | bytearray | memoryview) -> DParseHdr:
         """Decode a header from bytes.
 
         :param data: bytes to decode
         """
 
     @abstractmethod
-    def foot_validate(self, data: bytes) -> bool:
+    def foot_validate(self, data: bytes | bytearray | memoryview) -> bool:
         """Validate a frame footer.
 
         :param data: bytes to validate
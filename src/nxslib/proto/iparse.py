@@ -42,7 +42,7 @@ class EParseStreamFlags(IntEnum):
 
 
 # TODO: only retcode as input, decode state from retcode value
-@dataclass
+@dataclass(slots=True)
 class ParseAck:
     """Nxslib ACK frame."""
 
@@ -55,7 +55,7 @@ class ParseAck:
 ###############################################################################
 
 
-@dataclass
+@dataclass(slots=True)
 class ParseCmninfo:
     """Nxslib cmninfo frame."""
 
@@ -69,7 +69,7 @@ class ParseCmninfo:
 ###############################################################################
 
 
-@dataclass
+@dataclass(slots=True)
 class DParseStreamData:
     """Nxslib stream data."""
 
@@ -86,7 +86,7 @@ class DParseStreamData:
 ###############################################################################
 
 
-@dataclass
+@dataclass(slots=True)
 class DParseStream:
     """Nxslib stream data."""
 
@@ -113,7 +113,7 @@ class EParseDataType(IntEnum):
 ###############################################################################
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DsfmtItem:
     """Stream data format."""
 
@@ -129,12 +129,12 @@ class DsfmtItem:
 # Function: msfmt_get
 ###############################################################################
 
+_MSFMT_DICT = {0: "", 1: "B", 2: "H", 4: "I", 8: "Q"}
+
 
 def msfmt_get(mlen: int) -> str:
     """Get metadata format."""
-    msfmt_dict = {0: "", 1: "B", 2: "H", 4: "I", 8: "Q"}
-
-    meta = msfmt_dict.get(mlen)
+    meta = _MSFMT_DICT.get(mlen)
     if meta is None:
         # otherwise decode as bytes
         meta = str(mlen) + "B"
@@ -146,130 +146,131 @@ def msfmt_get(mlen: int) -> str:
 # Function: dsfmt_get
 ###############################################################################
 
+# built-in stream data formats, created once
+# (size in bytes, unpack fmt, scale factor, data type)
+_DSFMT_DICT = {
+    EDeviceChannelType.NONE.value: DsfmtItem(
+        0,
+        "",
+        None,
+        EParseDataType.NONE,
+    ),
+    EDeviceChannelType.UINT8.value: DsfmtItem(
+        1,
+        "B",
+        1,
+        EParseDataType.NUM,
+    ),
+    EDeviceChannelType.INT8.value: DsfmtItem(
+        1,
+        "b",
+        1,
+        EParseDataType.NUM,
+    ),
+    EDeviceChannelType.UINT16.value: DsfmtItem(
+        2,
+        "H",
+        1,
+        EParseDataType.NUM,
+    ),
+    EDeviceChannelType.INT16.value: DsfmtItem(
+        2,
+        "h",
+        1,
+        EParseDataType.NUM,
+    ),
+    EDeviceChannelType.UINT32.value: DsfmtItem(
+        4,
+        "I",
+        1,
+        EParseDataType.NUM,
+    ),
+    EDeviceChannelType.INT32.value: DsfmtItem(
+        4,
+        "i",
+        1,
+        EParseDataType.NUM,
+    ),
+    EDeviceChannelType.UINT64.value: DsfmtItem(
+        8,
+        "Q",
+        1,
+        EParseDataType.NUM,
+    ),
+    EDeviceChannelType.INT64.value: DsfmtItem(
+        8,
+        "q",
+        1,
+        EParseDataType.NUM,
+    ),
+    EDeviceChannelType.FLOAT.value: DsfmtItem(
+        4,
+        "f",
+        1.0,
+        EParseDataType.NUM,
+    ),
+    EDeviceChannelType.DOUBLE.value: DsfmtItem(
+        8,
+        "d",
+        1.0,
+        EParseDataType.NUM,
+    ),
+    EDeviceChannelType.UB8.value: DsfmtItem(
+        2,
+        "H",
+        256.0,
+        EParseDataType.NUM,
+    ),
+    EDeviceChannelType.B8.value: DsfmtItem(
+        2,
+        "h",
+        256.0,
+        EParseDataType.NUM,
+    ),
+    EDeviceChannelType.UB16.value: DsfmtItem(
+        4,
+        "I",
+        65536.0,
+        EParseDataType.NUM,
+    ),
+    EDeviceChannelType.B16.value: DsfmtItem(
+        4,
+        "i",
+        65536.0,
+        EParseDataType.NUM,
+    ),
+    EDeviceChannelType.UB32.value: DsfmtItem(
+        8,
+        "Q",
+        4294967296.0,
+        EParseDataType.NUM,
+    ),
+    EDeviceChannelType.B32.value: DsfmtItem(
+        8,
+        "q",
+        4294967296.0,
+        EParseDataType.NUM,
+    ),
+    EDeviceChannelType.CHAR.value: DsfmtItem(
+        1,
+        "s",
+        None,
+        EParseDataType.CHAR,
+    ),
+    EDeviceChannelType.WCHAR.value: DsfmtItem(
+        1,
+        "s",
+        None,
+        EParseDataType.CHAR,
+    ),
+}
+
 
 def dsfmt_get(
     dtype: int, user: dict[int, DsfmtItem] | None = None
 ) -> DsfmtItem:
     """Get data format."""
-    # tuple of (size in bytes, unpack fmt, scale factor)
-    dsfmt_dict = {
-        EDeviceChannelType.NONE.value: DsfmtItem(
-            0,
-            "",
-            None,
-            EParseDataType.NONE,
-        ),
-        EDeviceChannelType.UINT8.value: DsfmtItem(
-            1,
-            "B",
-            1,
-            EParseDataType.NUM,
-        ),
-        EDeviceChannelType.INT8.value: DsfmtItem(
-            1,
-            "b",
-            1,
-            EParseDataType.NUM,
-        ),
-        EDeviceChannelType.UINT16.value: DsfmtItem(
-            2,
-            "H",
-            1,
-            EParseDataType.NUM,
-        ),
-        EDeviceChannelType.INT16.value: DsfmtItem(
-            2,
-            "h",
-            1,
-            EParseDataType.NUM,
-        ),
-        EDeviceChannelType.UINT32.value: DsfmtItem(
-            4,
-            "I",
-            1,
-            EParseDataType.NUM,
-        ),
-        EDeviceChannelType.INT32.value: DsfmtItem(
-            4,
-            "i",
-            1,
-            EParseDataType.NUM,
-        ),
-        EDeviceChannelType.UINT64.value: DsfmtItem(
-            8,
-            "Q",
-            1,
-            EParseDataType.NUM,
-        ),
-        EDeviceChannelType.INT64.value: DsfmtItem(
-            8,
-            "q",
-            1,
-            EParseDataType.NUM,
-        ),
-        EDeviceChannelType.FLOAT.value: DsfmtItem(
-            4,
-            "f",
-            1.0,
-            EParseDataType.NUM,
-        ),
-        EDeviceChannelType.DOUBLE.value: DsfmtItem(
-            8,
-            "d",
-            1.0,
-            EParseDataType.NUM,
-        ),
-        EDeviceChannelType.UB8.value: DsfmtItem(
-            2,
-            "H",
-            256.0,
-            EParseDataType.NUM,
-        ),
-        EDeviceChannelType.B8.value: DsfmtItem(
-            2,
-            "h",
-            256.0,
-            EParseDataType.NUM,
-        ),
-        EDeviceChannelType.UB16.value: DsfmtItem(
-            4,
-            "I",
-            65536.0,
-            EParseDataType.NUM,
-        ),
-        EDeviceChannelType.B16.value: DsfmtItem(
-            4,
-            "i",
-            65536.0,
-            EParseDataType.NUM,
-        ),
-        EDeviceChannelType.UB32.value: DsfmtItem(
-            8,
-            "Q",
-            4294967296.0,
-            EParseDataType.NUM,
-        ),
-        EDeviceChannelType.B32.value: DsfmtItem(
-            8,
-            "q",
-            4294967296.0,
-            EParseDataType.NUM,
-        ),
-        EDeviceChannelType.CHAR.value: DsfmtItem(
-            1,
-            "s",
-            None,
-            EParseDataType.CHAR,
-        ),
-        EDeviceChannelType.WCHAR.value: DsfmtItem(
-            1,
-            "s",
-            None,
-            EParseDataType.CHAR,
-        ),
-    }
-
-    dsfmt = dsfmt_dict.get(dtype)
+    dsfmt = _DSFMT_DICT.get(dtype)
     if not dsfmt:
         # try from user specific types
         if user:
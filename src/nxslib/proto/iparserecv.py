@@ -18,7 +18,7 @@ if TYPE_CHECKING:
 ###############################################################################
 
 
-@dataclass
+@dataclass(slots=True)
 class ParseRecvCb:
     """Receiver parser callbacks."""
 
@@ -80,5 +80,7 @@ class ICommParseRecv(ABC):
         """Encode ACK frame."""
 
     @abstractmethod
-    def recv_handle(self, data: bytes) -> None:
+    def recv_handle(
+        self, data: bytes, start: int = 0, end: int | None = None
+    ) -> None:
         """Handle received frame."""
@@ -1,7 +1,8 @@
 """Module containing the NxScope data parser."""
 
 import struct
-from typing import Any
+import weakref
+from typing import TYPE_CHECKING, Any
 
 from nxslib.dev import Device, DeviceChannel
 from nxslib.proto.iframe import DParseFrame, EParseId, ICommFrame
@@ -19,6 +20,34 @@ from nxslib.proto.iparse import (
 )
 from nxslib.proto.serialframe import SerialFrame
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    StreamConv = Callable[[tuple[Any, ...]], tuple[Any, ...]]
+    StreamDecoder = Callable[[bytes, int], tuple[DParseStreamData, int]]
+    StreamRunDecoder = Callable[[bytes], list[DParseStreamData] | None]
+
+# precompiled frame formats
+_ST_SET_SINGLE = struct.Struct("BBc")
+_ST_START = struct.Struct("?")
+_ST_CHINFO_REQ = struct.Struct("b")
+_ST_CMNINFO = struct.Struct("BBB")
+_ST_ACK = struct.Struct("i")
+
+# map any non-zero byte to 1
+_BOOL_TABLE = bytes([0]) + bytes([1]) * 255
+
+# single byte enable payloads
+_BOOL_BYTES = (b"\x00", b"\x01")
+
+# constant set frame headers (flags, channel)
+_SET_BULK_HDR = bytes((EParseIdSetFlags.BULK, 0))
+_SET_ALL_HDR = bytes((EParseIdSetFlags.ALL, 0))
+
+# frame IDs checked on the receive path
+_FID_STREAM = EParseId.STREAM
+_FID_ACK = EParseId.ACK
+
 ###############################################################################
 # Class: Parser
 ###############################################################################
@@ -31,56 +60,279 @@ class Parser(ICommParse):
         self,
         frame: type[ICommFrame] = SerialFrame,
         user_types: dict[int, DsfmtItem] | None = None,
+        raw_num: bool = False,
+        raw_char: bool = False,
     ) -> None:
         """Initialize the Nxslib parser.
 
         :param frame: instance of the frame parser
+        :param user_types: user specific data types
+        :param raw_num: return numerical stream data as received (unscaled)
+        :param raw_char: return char stream data as bytes (not decoded)
         """
         self._frame = frame()
         self._user_types = user_types
 
-    def _frame_set_data(self, flags: int, chan: int = 0) -> bytes:
-        return struct.pack("BB", flags, chan)
+        # frames without variable data are created once
+        self._frame_cmninfo = self._frame.frame_create(EParseId.CMNINFO, None)
+        self._frame_start = (
+            self._frame.frame_create(EParseId.START, _ST_START.pack(False)),
+            self._frame.frame_create(EParseId.START, _ST_START.pack(True)),
+        )
+        self._raw_num = raw_num
+        self._raw_char = raw_char
+
+        # compiled stream formats for (dtype, vdim, mlen)
+        self._sfmt_cache: dict[
+            tuple[int, int, int],
+            tuple[DsfmtItem, struct.Struct, int],
+        ] = {}
+
+        # chinfo formats for a given channel name length
+        self._chinfo_cache: dict[int, struct.Struct] = {}
+
+        # per-device stream decoders for channel IDs
+        self._decoders: weakref.WeakKeyDictionary[
+            Device, dict[int, "StreamDecoder"]
+        ] = weakref.WeakKeyDictionary()
+
+        # per-device decoders for frames with samples from one channel only
+        self._runs: weakref.WeakKeyDictionary[
+            Device, dict[int, "StreamRunDecoder"]
+        ] = weakref.WeakKeyDictionary()
 
     def _frame_set_single(
         self, _id: EParseId, data: bytes, chan: int
     ) -> bytes:
         """Set single channel frame."""
         assert len(data) == 1
-        _bytes = self._frame_set_data(EParseIdSetFlags.SINGLE, chan)
-        _bytes += data
+        _bytes = _ST_SET_SINGLE.pack(EParseIdSetFlags.SINGLE, chan, data)
         return self._frame.frame_create(_id, _bytes)
 
     def _frame_set_bulk(self, _id: EParseId, data: bytes) -> bytes:
         """Set bulk frame."""
         assert len(data) > 0
-        _bytes = self._frame_set_data(EParseIdSetFlags.BULK)
-        _bytes += data
+        _bytes = _SET_BULK_HDR + data
         return self._frame.frame_create(_id, _bytes)
 
     def _frame_set_all(self, _id: EParseId, data: bytes) -> bytes:
         """Set all frame."""
         assert len(data) == 1
-        _bytes = self._frame_set_data(EParseIdSetFlags.ALL)
-        _bytes += data
+        _bytes = _SET_ALL_HDR + data
         return self._frame.frame_create(_id, _bytes)
 
-    def _stream_data_get(
-        self, decode: DsfmtItem, unpacked: tuple[Any, ...]
-    ) -> tuple[Any, ...]:
-        if decode.dtype == EParseDataType.NUM and decode.scale:
-            # scale numerical data if scaling factor available
-            retdata = tuple(x / decode.scale for x in unpacked)
+    def _stream_fmt_get(
+        self, chan: DeviceChannel
+    ) -> tuple[DsfmtItem, struct.Struct, int]:
+        """Get compiled sample format for a given channel.
 
-        elif decode.dtype is EParseDataType.CHAR and len(unpacked) == 1:
-            # decode bytes to string if possible
-            retdata = (unpacked[0].decode(),)
+        Sample format covers data and metadata, the number of data items
+        is returned together with format.
+        """
+        key = (chan.data.dtype, chan.data.vdim, chan.data.mlen)
+        fmt = self._sfmt_cache.get(key)
+        if fmt is not None:
+            return fmt
+
+        # decode sample type
+        decode = dsfmt_get(chan.data.dtype, self._user_types)
+        if decode.user:  # pragma: no cover
+            # NxScope compatibility:
+            #   real type size is determined with vdim, not by slen
+            assert struct.calcsize("<" + decode.dsfmt) == chan.data.vdim
+
+        # data always packed as little-endian
+        sfmt = "<"
+        if chan.data.vdim and not decode.user:
+            sfmt += str(chan.data.vdim)
+        sfmt += decode.dsfmt
+
+        # number of data items in a sample, the rest is metadata
+        ndata = len(struct.unpack(sfmt, bytes(struct.calcsize(sfmt))))
+
+        # data and metadata are unpacked at once
+        sfmt += msfmt_get(chan.data.mlen)
+
+        fmt = (decode, struct.Struct(sfmt), ndata)
+        self._sfmt_cache[key] = fmt
+        return fmt
+
+    def _stream_decoder_create(self, chan: DeviceChannel) -> "StreamDecoder":
+        """Create a stream sample decoder for a given channel."""
+        decode, sfmt, ndata = self._stream_fmt_get(chan)
+
+        # channel configuration is read-only, resolve it once
+        chid = chan.data.chan
+        dtype = decode.dtype
+        vdim = chan.data.vdim
+        mlen = chan.data.mlen
+        sunpack = sfmt.unpack_from
+        ssize = sfmt.size
+        conv = self._stream_data_conv(decode, vdim)
+
+        # specialize decoder once so that no per-sample branching on the
+        # channel configuration is needed
+        if mlen:
+
+            def decoder_meta(
+                data: bytes, i: int
+            ) -> tuple[DParseStreamData, int]:
+                # unpack data and metadata directly from the frame buffer
+                unpacked = sunpack(data, i)
+                i += ssize
+
+                # format stream data
+                retdata = unpacked[:ndata]
+                if conv:
+                    retdata = conv(retdata)
+
+                sample = DParseStreamData(
+                    chan=chid,
+                    dtype=dtype,
+                    vdim=vdim,
+                    mlen=mlen,
+                    data=retdata,
+                    meta=unpacked[ndata:],
+                )
+                return sample, i
+
+            return decoder_meta
+
+        def decoder(data: bytes, i: int) -> tuple[DParseStreamData, int]:
+            # unpack data directly from the frame buffer
+            retdata = sunpack(data, i)
+            i += ssize
 
-        else:
-            # otherwise return without formating
-            retdata = unpacked
+            # format stream data
+            if conv:
+                retdata = conv(retdata)
+
+            # no metadata for this channel
+            sample = DParseStreamData(
+                chan=chid,
+                dtype=dtype,
+                vdim=vdim,
+                mlen=0,
+                data=retdata,
+                meta=(),
+            )
+            return sample, i
+
+        return decoder
+
+    def _stream_decoder_add(
+        self, dev: Device, decoders: dict[int, "StreamDecoder"], chid: int
+    ) -> "StreamDecoder":
+        """Add a stream sample decoder for a given device channel."""
+        chan = dev.channel_get(chid)
+        assert chan
+        decoder = self._stream_decoder_create(chan)
+        decoders[chid] = decoder
+        return decoder
+
+    def _stream_run_create(self, chan: DeviceChannel) -> "StreamRunDecoder":
+        """Create a decoder for a frame with samples from one channel only."""
+        decode, sfmt, ndata = self._stream_fmt_get(chan)
+
+        # one record is: channel id (skipped), data and metadata
+        rfmt = struct.Struct("<x" + sfmt.format[1:])
+        rsize = rfmt.size
+        riter = rfmt.iter_unpack
+
+        chid = chan.data.chan
+        dtype = decode.dtype
+        vdim = chan.data.vdim
+        mlen = chan.data.mlen
+        conv = self._stream_data_conv(decode, vdim)
+
+        def run(data: bytes) -> list[DParseStreamData] | None:
+            # all records must belong to this channel
+            nrec, rem = divmod(len(data) - 1, rsize)
+            if rem or data[1::rsize].count(chid) != nrec:
+                return None
+
+            # build the samples list in one pass over the records
+            records = riter(memoryview(data)[1:])
+            if conv:
+                return [
+                    DParseStreamData(
+                        chan=chid,
+                        dtype=dtype,
+                        vdim=vdim,
+                        mlen=mlen,
+                        data=conv(rec[:ndata]),
+                        meta=rec[ndata:],
+                    )
+                    for rec in records
+                ]
+
+            return [
+                DParseStreamData(
+                    chan=chid,
+                    dtype=dtype,
+                    vdim=vdim,
+                    mlen=mlen,
+                    data=rec[:ndata],
+                    meta=rec[ndata:],
+                )
+                for rec in records
+            ]
+
+        return run
+
+    def _stream_run_get(self, dev: Device, chid: int) -> "StreamRunDecoder":
+        """Get a single channel frame decoder for a given device channel."""
+        runs = self._runs.get(dev)
+        if runs is None:
+            runs = {}
+            self._runs[dev] = runs
+
+        run = runs.get(chid)
+        if run is None:
+            chan = dev.channel_get(chid)
+            assert chan
+            run = self._stream_run_create(chan)
+            runs[chid] = run
+
+        return run
+
+    def _stream_data_conv(
+        self, decode: DsfmtItem, vdim: int
+    ) -> "StreamConv | None":
+        """Get a stream data converter or None if no conversion needed."""
+        if (
+            decode.dtype == EParseDataType.NUM
+            and decode.scale
+            and not self._raw_num
+        ):
+            # scale numerical data if scaling factor available,
+            # divide, a reciprocal multiply is exact only for powers of two
+            scale = decode.scale
+
+            if vdim <= 1:
+
+                def conv_scalar(unpacked: tuple[Any, ...]) -> tuple[Any, ...]:
+                    return (unpacked[0] / scale,)
+
+                return conv_scalar
+
+            def conv_vector(unpacked: tuple[Any, ...]) -> tuple[Any, ...]:
+                return tuple(x / scale for x in unpacked)
+
+            return conv_vector
 
-        return retdata
+        if decode.dtype is EParseDataType.CHAR and not self._raw_char:
+
+            def conv_char(unpacked: tuple[Any, ...]) -> tuple[Any, ...]:
+                # decode bytes to string if possible
+                if len(unpacked) == 1:
+                    return (unpacked[0].decode(),)
+                return unpacked
+
+            return conv_char
+
+        # otherwise return without formating
+        return None
 
     @property
     def frame(self) -> ICommFrame:
@@ -89,67 +341,84 @@ class Parser(ICommParse):
 
     def frame_start(self, start: bool) -> bytes:
         """Create a start frame."""
-        _bytes = struct.pack("?", start)
-        return self._frame.frame_create(EParseId.START, _bytes)
+        return self._frame_start[bool(start)]
 
     def frame_cmninfo(self) -> bytes:
         """Create a cmninfo frame."""
-        return self._frame.frame_create(EParseId.CMNINFO, None)
+        return self._frame_cmninfo
 
     def frame_chinfo(self, chan: int) -> bytes:
         """Create a chinfo frame."""
-        _bytes = struct.pack("b", chan)
+        _bytes = _ST_CHINFO_REQ.pack(chan)
         return self._frame.frame_create(EParseId.CHINFO, _bytes)
 
     def frame_enable(
-        self, enable: tuple[int, bool] | list[bool], chmax: int
+        self,
+        enable: tuple[int, bool] | list[bool] | bytes | bytearray,
+        chmax: int,
     ) -> bytes:
-        """Create a enable frame."""
+        """Create a enable frame.
+
+        :param enable: (channel, state) tuple for a single channel,
+          or one state per channel
+        :param chmax: the number of device channels
+        :raises ValueError: if per-channel states don't match chmax
+        """
         # single channel change
-        if isinstance(enable, tuple) is True:
+        if isinstance(enable, tuple):
             # for tuple: first element is channel id,
             #            second element is enable value
             chan = enable[0]
-            data = bytes([enable[1]])
+            data = _BOOL_BYTES[bool(enable[1])]
             return self._frame_set_single(EParseId.ENABLE, data, chan)
 
+        # one value per channel expected
+        if len(enable) != chmax:
+            msg = f"expected {chmax} enable values, got {len(enable)}"
+            raise ValueError(msg)
+
         # all the same
-        if len(enable) == chmax and len(set(enable)) <= 1:
-            data = bytes([enable[0]])
+        if all(x == enable[0] for x in enable):
+            data = _BOOL_BYTES[bool(enable[0])]
             return self._frame_set_all(EParseId.ENABLE, data)
 
-        # bulk request for all channels
-        data = b""
-        for _chan in range(chmax):
-            if enable[_chan] is True:
-                # en byte
-                data += b"\x01"
-            else:
-                # en byte
-                data += b"\x00"
+        # bulk request for all channels - one en byte per channel
+        if isinstance(enable, (bytes, bytearray)):
+            # bytes-like mask normalized in one pass
+            data = bytes(enable).translate(_BOOL_TABLE)
+        else:
+            data = bytes(map(bool, enable))
 
         return self._frame_set_bulk(EParseId.ENABLE, data)
 
     def frame_div(self, div: tuple[int, int] | list[int], chmax: int) -> bytes:
-        """Create a div frame."""
+        """Create a div frame.
+
+        :param div: (channel, divider) tuple for a single channel,
+          or one divider per channel
+        :param chmax: the number of device channels
+        :raises ValueError: if per-channel dividers don't match chmax
+        """
         # single channel change
-        if isinstance(div, tuple) is True:
+        if isinstance(div, tuple):
             # for tuple: first element is channel id,
             #            second element is div value
             chan = div[0]
             data = bytes([div[1]])
             return self._frame_set_single(EParseId.DIV, data, chan)
 
+        # one value per channel expected
+        if len(div) != chmax:
+            msg = f"expected {chmax} div values, got {len(div)}"
+            raise ValueError(msg)
+
         # all the same
-        if len(div) == chmax and len(set(div)) <= 1:
+        if all(x == div[0] for x in div):
             data = bytes([int(div[0])])
             return self._frame_set_all(EParseId.DIV, data)
 
-        # bulk request for all channels
-        data = b""
-        for chan in range(chmax):
-            # div byte
-            data += bytes([div[chan]])
+        # bulk request for all channels - one div byte per channel
+        data = bytes(div)
 
         return self._frame_set_bulk(EParseId.DIV, data)
 
@@ -162,66 +431,58 @@ class Parser(ICommParse):
             return None
 
         # invalid frame ID
-        if frame.fid != EParseId.STREAM:
+        if frame.fid != _FID_STREAM:
             return None
 
         if not frame.data:
             return None
 
-        # parse samples data
         # first byte is stream data is always flags byte - ommit it for now
-        samples = []
+        data = frame.data
+        size = len(data)
+        if size == 1:
+            return DParseStream(flags=data[0], samples=[])
+
+        # frames with samples from one channel only are decoded in one pass
+        run = self._stream_run_get(dev, data[1])(data)
+        if run is not None:
+            return DParseStream(flags=data[0], samples=run)
+
+        # decoders are built once per device channel
+        decoders = self._decoders.get(dev)
+        if decoders is None:
+            decoders = {}
+            self._decoders[dev] = decoders
+
+        # parse samples data
+        samples: list[DParseStreamData] = []
+        append = samples.append
         i = 1
-        while i < len(frame.data):
+        while i < size:
             # first byte in stream data sequence - channel id
-            chan = dev.channel_get(frame.data[i])
-            assert chan
-            i += 1
-
-            # decode meta data
-            meta = msfmt_get(chan.data.mlen)
+            decoder = decoders.get(data[i])
+            if decoder is None:
+                decoder = self._stream_decoder_add(dev, decoders, data[i])
 
-            # decode sample type
-            decode = dsfmt_get(chan.data.dtype, self._user_types)
-            if decode.user:  # pragma: no cover
-                # NxScope compatibility:
-                #   real type size is determined with vdim, not by slen
-                assert struct.calcsize("<" + decode.dsfmt) == chan.data.vdim
+            sample, i = decoder(data, i + 1)
+            append(sample)
 
-            # data always packed as little-endian
-            sfmt = "<"
-            if chan.data.vdim and not decode.user:
-                sfmt += str(chan.data.vdim)
-            sfmt += decode.dsfmt
+        # return samples data and flags (always firtst byte in stream data)
+        return DParseStream(flags=data[0], samples=samples)
 
-            # unpack data
-            offset = decode.slen * chan.data.vdim
-            unpacked = struct.unpack(sfmt, frame.data[i : i + offset])
-            i += offset
+    def frame_stream_decode_many(
+        self, frames: "Iterable[DParseFrame]", dev: Device
+    ) -> list[DParseStream]:
+        """Decode many stream frames.
 
-            # format stream data
-            retdata = self._stream_data_get(decode, unpacked)
+        Frames that are not valid stream frames are skipped.
 
-            # unpack metadata
-            sfmt = "<" + meta
-            offset = chan.data.mlen
-            mdata = struct.unpack(sfmt, frame.data[i : i + offset])
-            i += offset
-
-            # sample
-            sample = DParseStreamData(
-                chan=chan.data.chan,
-                dtype=decode.dtype,
-                vdim=chan.data.vdim,
-                mlen=chan.data.mlen,
-                data=retdata,
-                meta=mdata,
-            )
-
-            samples.append(sample)
-
-        # return samples data and flags (always firtst byte in stream data)
-        return DParseStream(flags=frame.data[0], samples=samples)
+        :param frames: stream frames to decode
+        :param dev: device instance
+        """
+        decode = self.frame_stream_decode
+        sdata = (decode(frame, dev) for frame in frames)
+        return [x for x in sdata if x is not None]
 
     def frame_cmninfo_decode(self, frame: DParseFrame) -> ParseCmninfo | None:
         """Decode a cmninfo frame."""
@@ -233,11 +494,7 @@ class Parser(ICommParse):
         if frame.fid != EParseId.CMNINFO:
             return None
 
-        cmninfo_bytes = 3
-        cmninfo_decode = "BBB"
-        chmax, flags, rxpadding = struct.unpack(
-            cmninfo_decode, frame.data[:cmninfo_bytes]
-        )
+        chmax, flags, rxpadding = _ST_CMNINFO.unpack_from(frame.data)
 
         return ParseCmninfo(chmax, flags, rxpadding)
 
@@ -255,13 +512,17 @@ class Parser(ICommParse):
 
         # decode channels info
         nlen = len(frame.data) - 5
-        chinfo_decode = f"BBBBB{nlen}s"
+        chinfo_decode = self._chinfo_cache.get(nlen)
+        if chinfo_decode is None:
+            chinfo_decode = struct.Struct(f"BBBBB{nlen}s")
+            self._chinfo_cache[nlen] = chinfo_decode
 
-        en, _type, vdim, div, mlen, _str = struct.unpack(
-            chinfo_decode, frame.data
+        en, _type, vdim, div, mlen, _str = chinfo_decode.unpack_from(
+            frame.data
         )
 
-        name = "" if not _str else _str.decode().split("\x00")[0]
+        # name ends at the first NUL, decode only that part
+        name = _str.partition(b"\x00")[0].decode()
 
         return DeviceChannel(
             chan=chan,
@@ -275,11 +536,11 @@ class Parser(ICommParse):
 
     def frame_is_ack(self, frame: DParseFrame) -> bool:
         """Return true if a given frame is ACK."""
-        return frame.fid == EParseId.ACK
+        return frame.fid == _FID_ACK
 
     def frame_is_stream(self, frame: DParseFrame) -> bool:
         """Return true if a given frame is STREAM."""
-        return frame.fid == EParseId.STREAM
+        return frame.fid == _FID_STREAM
 
     def frame_ack_decode(self, frame: DParseFrame) -> ParseAck | None:
         """Decode ACK frame."""
@@ -287,10 +548,10 @@ class Parser(ICommParse):
         if frame is None:
             return None
 
-        if frame.fid != EParseId.ACK:
+        if frame.fid != _FID_ACK:
             return None
 
-        ret = struct.unpack("i", frame.data)[0]
+        (ret,) = _ST_ACK.unpack_from(frame.data)
         if not ret:
             return ParseAck(True, 0)
 
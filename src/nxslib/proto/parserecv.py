@@ -18,6 +18,20 @@ from nxslib.proto.serialframe import SerialFrame
 if TYPE_CHECKING:
     from nxslib.dev import Device, DeviceChannel
 
+# precompiled frame formats
+_ST_CMNINFO = struct.Struct("BBB")
+_ST_FLAGS = struct.Struct("b")
+_ST_START = struct.Struct("?")
+_ST_SET = struct.Struct("BB")
+_ST_EN = struct.Struct("?")
+_ST_DIV = struct.Struct("b")
+_ST_ACK = struct.Struct("i")
+
+# set frame flags resolved once, used in hot paths
+_SINGLE = EParseIdSetFlags.SINGLE.value
+_BULK = EParseIdSetFlags.BULK.value
+_ALL = EParseIdSetFlags.ALL.value
+
 ###############################################################################
 # Class: ParseRecv
 ###############################################################################
@@ -41,66 +55,127 @@ class ParseRecv(ICommParseRecv):
         self._frame = frame()
         self._user_types = user_types
 
+        # positive ACK frame is created once
+        self._frame_ack_ok = self._frame.frame_create(
+            EParseId.ACK, _ST_ACK.pack(0)
+        )
+
+        # persistent receive buffer for recv_feed()
+        self._rx = bytearray()
+
+        # receiver callbacks for frame IDs
+        self._recv_cb_dispatch = {
+            EParseId.CMNINFO: self._recv_cb_cmninfo,
+            EParseId.CHINFO: self._recv_cb_chinfo,
+            EParseId.START: self._recv_cb_start,
+            EParseId.ENABLE: self._recv_cb_enable,
+            EParseId.DIV: self._recv_cb_div,
+        }
+
+        # chinfo formats for a given channel name length
+        self._chinfo_cache: dict[int, struct.Struct] = {}
+
+        # bulk div formats for a given number of channels
+        self._bulk_div_cache: dict[int, struct.Struct] = {}
+
+        # compiled stream formats for (dtype, vdim, mlen)
+        self._sfmt_cache: dict[
+            tuple[int, int, int], tuple[DsfmtItem, struct.Struct]
+        ] = {}
+
     def _cmninfo_data_encode(self, dev: "Device") -> bytes:
         """Encode cmninfo frame data."""
-        _bytes = b""
-
         # general info
-        _bytes = struct.pack(
-            "BBB", dev.data.chmax, dev.data.flags, dev.data.rxpadding
+        return _ST_CMNINFO.pack(
+            dev.data.chmax, dev.data.flags, dev.data.rxpadding
         )
 
-        return _bytes
-
     def _chinfo_data_encode(self, chan: "DeviceChannel") -> bytes:
         """Encode info frame data."""
-        _bytes = b""
+        name = bytes(chan.data.name, "utf-8")
+
+        # chan info format for a given name length
+        nlen = len(name)
+        fmt = self._chinfo_cache.get(nlen)
+        if fmt is None:
+            fmt = struct.Struct(f"?BBBB{nlen}s")
+            self._chinfo_cache[nlen] = fmt
 
         # chan info
-        nlen = len(chan.data.name)
-        _bytes += struct.pack(
-            f"?BBBB{nlen}s",
+        return fmt.pack(
             chan.data.en,
             chan.data.dtype,
             chan.data.vdim,
             chan.data.div,
             chan.data.mlen,
-            bytes(chan.data.name, "utf-8"),
+            name,
         )
 
-        return _bytes
+    def _bulk_div_get(self, chmax: int) -> struct.Struct:
+        """Get compiled bulk div format for a given number of channels."""
+        fmt = self._bulk_div_cache.get(chmax)
+        if fmt is None:
+            # div is signed
+            fmt = struct.Struct(f"{chmax}b")
+            self._bulk_div_cache[chmax] = fmt
+        return fmt
+
+    def _stream_fmt_get(
+        self, sample: DParseStreamData
+    ) -> tuple[DsfmtItem, struct.Struct]:
+        """Get compiled sample format for a given sample type."""
+        key = (sample.dtype, sample.vdim, sample.mlen)
+        fmt = self._sfmt_cache.get(key)
+        if fmt is not None:
+            return fmt
+
+        # sample format
+        decode = dsfmt_get(sample.dtype, self._user_types)
 
-    def _stream_bytes_get(
-        self, decode: DsfmtItem, sample: DParseStreamData
-    ) -> bytes:
         # pack data - always as little-endian
-        fmt = "<" + "b"
+        sfmt = "<" + "b"
         if sample.vdim:
             if not decode.user:
-                fmt += str(sample.vdim) + decode.dsfmt
+                sfmt += str(sample.vdim) + decode.dsfmt
             else:
                 # NxScope compatibility:
                 #   ignore vdim and use format string only
-                fmt += decode.dsfmt
+                sfmt += decode.dsfmt
+
+        # metadata packed together with data
+        sfmt += msfmt_get(sample.mlen)
+
+        fmt = (decode, struct.Struct(sfmt))
+        self._sfmt_cache[key] = fmt
+        return fmt
+
+    def _stream_bytes_get(
+        self, decode: DsfmtItem, sfmt: struct.Struct, sample: DParseStreamData
+    ) -> bytes:
+        meta = sample.meta if sample.mlen else ()
 
         if decode.dtype == EParseDataType.NUM:
-            if decode.scale:
-                # scale numeric data
-                vect_scale_l = [x * decode.scale for x in sample.data]
+            scale = decode.scale
+            if scale and scale != 1:
+                # scale numeric data to the nearest fixed-point value
+                _bytes = sfmt.pack(
+                    sample.chan,
+                    *[round(x * scale) for x in sample.data],
+                    *meta,
+                )
             else:
-                # not scaled
-                vect_scale_l = list(sample.data)
-            _bytes = struct.pack(fmt, sample.chan, *vect_scale_l)
+                # not scaled - pack data as is
+                _bytes = sfmt.pack(sample.chan, *sample.data, *meta)
         elif decode.dtype == EParseDataType.CHAR:
             # string data
             vect_scale_t = (bytes(sample.data[0], "utf"),)
-            _bytes = struct.pack(fmt, sample.chan, *vect_scale_t)
+            _bytes = sfmt.pack(sample.chan, *vect_scale_t, *meta)
         elif decode.dtype is EParseDataType.NONE:
             # no data - encode channel num
-            _bytes = struct.pack(fmt, sample.chan)
+            _bytes = sfmt.pack(sample.chan, *meta)
         else:
             assert decode.dtype is EParseDataType.COMPLEX
-            _bytes = struct.pack(fmt, sample.chan, *sample.data)
+            _bytes = sfmt.pack(sample.chan, *sample.data, *meta)
 
         return _bytes
 
@@ -109,10 +184,9 @@ class ParseRecv(ICommParseRecv):
     ) -> bytes | None:
         """Encode stream frame data."""
         flags = 0
-        _bytes = b""
 
-        # pack flags
-        _bytes += struct.pack("b", flags)
+        # pack flags - frame data is built in place
+        _bytes = bytearray(_ST_FLAGS.pack(flags))
 
         # pack samples
         cntr = 0
@@ -125,23 +199,16 @@ class ParseRecv(ICommParseRecv):
             cntr += 1
 
             # sample format
-            decode = dsfmt_get(sample.dtype, self._user_types)
-
-            # meta format
-            msfmt = msfmt_get(sample.mlen)
-
-            # get bytes
-            _bytes += self._stream_bytes_get(decode, sample)
+            decode, sfmt = self._stream_fmt_get(sample)
 
-            # add metadata
-            if len(msfmt) > 0:
-                _bytes += struct.pack(msfmt, *sample.meta)
+            # get bytes with data and metadata
+            _bytes += self._stream_bytes_get(decode, sfmt, sample)
 
         # do not return bytes if no sample data
         if cntr == 0:
             return None
 
-        return _bytes
+        return bytes(_bytes)
 
     def _recv_cb_cmninfo(self, data: bytes) -> None:
         """Handle recv cmninfo request."""
@@ -170,44 +237,33 @@ class ParseRecv(ICommParseRecv):
 
     def _recv_cb_handle(self, fid: EParseId, fdata: bytes) -> None:
         # STREAM frames are not accepted here
-        if fid == EParseId.CMNINFO:
-            self._recv_cb_cmninfo(fdata)
-        elif fid == EParseId.CHINFO:
-            self._recv_cb_chinfo(fdata)
-        elif fid == EParseId.START:
-            self._recv_cb_start(fdata)
-        elif fid == EParseId.ENABLE:
-            self._recv_cb_enable(fdata)
-        elif fid == EParseId.DIV:
-            self._recv_cb_div(fdata)
-        else:
+        handler = self._recv_cb_dispatch.get(fid)
+        if handler is None:
             raise AssertionError
+        handler(fdata)
 
     def frame_start_decode(self, data: bytes) -> Any:
         """Hecode start frame."""
-        return struct.unpack("?", data[0:1])[0]
+        return _ST_START.unpack_from(data)[0]
 
     def frame_set_decode(self, data: bytes) -> tuple[Any, ...]:
         """Decode set type frame."""
-        return struct.unpack("BB", data)
+        return _ST_SET.unpack_from(data)
 
     def frame_enable_decode(self, data: bytes, dev: "Device") -> list[bool]:
         """Decode enable frame."""
         # decode set frame
-        flags, chan = self.frame_set_decode(data[:2])
-
-        if flags == EParseIdSetFlags.BULK.value:
-            fmt = str(dev.data.chmax) + "?"
-            ret = list(struct.unpack(fmt, data[2 : 2 + dev.data.chmax]))
-        elif flags == EParseIdSetFlags.SINGLE.value:
-            fmt = "?"
-            en = struct.unpack(fmt, data[2:3])[0]
+        flags, chan = self.frame_set_decode(data)
+
+        if flags == _BULK:
+            ret = list(map(bool, data[2 : 2 + dev.data.chmax]))
+        elif flags == _SINGLE:
+            en = _ST_EN.unpack_from(data, 2)[0]
             ret = dev.channels_en
             ret[chan] = bool(en)
-        elif flags == EParseIdSetFlags.ALL.value:
-            fmt = "?"
-            en = struct.unpack(fmt, data[2:3])[0]
-            ret = [en for i in range(dev.data.chmax)]
+        elif flags == _ALL:
+            en = _ST_EN.unpack_from(data, 2)[0]
+            ret = [en] * dev.data.chmax
         else:
             raise ValueError
 
@@ -216,20 +272,17 @@ class ParseRecv(ICommParseRecv):
     def frame_div_decode(self, data: bytes, dev: "Device") -> list[int]:
         """Decode divider frame."""
         # decode set frame
-        flags, chan = self.frame_set_decode(data[:2])
-
-        if flags == EParseIdSetFlags.BULK.value:
-            fmt = str(dev.data.chmax) + "b"
-            ret = list(struct.unpack(fmt, data[2 : 2 + dev.data.chmax]))
-        elif flags == EParseIdSetFlags.SINGLE.value:
-            fmt = "b"
-            div = struct.unpack(fmt, data[2:3])[0]
+        flags, chan = self.frame_set_decode(data)
+
+        if flags == _BULK:
+            ret = list(self._bulk_div_get(dev.data.chmax).unpack_from(data, 2))
+        elif flags == _SINGLE:
+            div = _ST_DIV.unpack_from(data, 2)[0]
             ret = dev.channels_div
             ret[chan] = div
-        elif flags == EParseIdSetFlags.ALL.value:
-            fmt = "b"
-            div = struct.unpack(fmt, data[2:3])[0]
-            ret = [div for i in range(dev.data.chmax)]
+        elif flags == _ALL:
+            div = _ST_DIV.unpack_from(data, 2)[0]
+            ret = [div] * dev.data.chmax
         else:
             raise ValueError
 
@@ -256,39 +309,115 @@ class ParseRecv(ICommParseRecv):
 
     def frame_ack_encode(self, data: int) -> bytes:
         """Encode ACK frame."""
-        _bytes = struct.pack("i", data)
+        if not data:
+            # positive ACK is always the same
+            return self._frame_ack_ok
+
+        _bytes = _ST_ACK.pack(data)
         return self._frame.frame_create(EParseId.ACK, _bytes)
 
-    def recv_handle(self, data: bytes) -> None:
-        """Handle received frame."""
+    def recv_handle(
+        self, data: bytes, start: int = 0, end: int | None = None
+    ) -> None:
+        """Handle received frame.
+
+        The frame is searched only in ``data[start:end]``, so callers with
+        a larger receive buffer can pass indices instead of a slice.
+
+        :param data: received bytes
+        :param start: frame search start index
+        :param end: frame search end index
+        """
         if data is None:
             return
 
-        hdr_start = self._frame.hdr_find(data)
+        if end is None:
+            end = len(data)
+
+        hdr_start = self._frame.hdr_find(data, start, end)
         if hdr_start < 0:
             return
 
-        if (len(data) - hdr_start) < (
-            self._frame.hdr_len + self._frame.foot_len
-        ):
+        if (end - hdr_start) < (self._frame.hdr_len + self._frame.foot_len):
             return
 
-        # crop data
-        data = data[hdr_start:]
+        # crop data - no copy
+        mv = memoryview(data)[hdr_start:end]
 
         # decode hdr
-        hdr = self._frame.hdr_decode(data)
+        hdr = self._frame.hdr_decode(mv)
         if hdr.err is not EParseError.NOERR:
             return
 
         # validate hdr
-        if self._frame.foot_validate(data[: hdr.flen]) is False:
+        if not self._frame.foot_validate(mv[: hdr.flen]):
             return
 
         # get frame data
-        fdata = data[self._frame.hdr_len : hdr.flen - self._frame.foot_len]
+        fdata = bytes(
+            mv[self._frame.hdr_len : hdr.flen - self._frame.foot_len]
+        )
 
         # handle frame
         self._recv_cb_handle(hdr.fid, fdata)
 
         return
+
+    def recv_feed(self, data: bytes) -> int:
+        """Handle all complete frames in received data.
+
+        Data is accumulated in a receive buffer, so frames can be split
+        across many calls. Incomplete frame data is kept for the next call.
+
+        :param data: received bytes
+        :return: number of handled frames
+        """
+        rx = self._rx
+        rx += data
+
+        hdr_len = self._frame.hdr_len
+        foot_len = self._frame.foot_len
+        frames = 0
+        while True:
+            hdr_start = self._frame.hdr_find(rx)
+            if hdr_start < 0:
+                # no frame candidate - drop all
+                rx.clear()
+                break
+
+            # drop data before header
+            del rx[:hdr_start]
+
+            if len(rx) < hdr_len + foot_len:
+                # wait for more data
+                break
+
+            # decode hdr
+            hdr = self._frame.hdr_decode(rx)
+            if hdr.err is not EParseError.NOERR or (
+                hdr.flen < hdr_len + foot_len
+            ):
+                # not a valid frame - drop 1 byte and look for the next
+                del rx[:1]
+                continue
+
+            if len(rx) < hdr.flen:
+                # wait for the rest of frame
+                break
+
+            # validate footer and get frame data
+            with memoryview(rx) as mv:
+                valid = self._frame.foot_validate(mv[: hdr.flen])
+                if valid:
+                    fdata = bytes(mv[hdr_len : hdr.flen - foot_len])
+
+            if not valid:
+                del rx[:1]
+                continue
+
+            # drop frame from buffer and handle frame
+            del rx[: hdr.flen]
+            self._recv_cb_handle(hdr.fid, fdata)
+            frames += 1
+
+        return frames
@@ -1,10 +1,9 @@
 """Module containing the NxScope serial protocol specific logic."""
 
 import struct
+from binascii import crc_hqx
 from enum import Enum
 
-import crcmod  # type: ignore
-
 from nxslib.logger import logger
 from nxslib.proto.iframe import (
     DParseFrame,
@@ -14,6 +13,20 @@ from nxslib.proto.iframe import (
     ICommFrame,
 )
 
+# header always encoded in little-endian, crc16 always big endian.
+# pack_into on precompiled Structs is faster than writing bytes by hand
+_ST_HDR = struct.Struct("<BHB")
+_ST_CRC = struct.Struct(">H")
+
+# start of frame marker
+_SOF_BYTES = b"\x55"
+
+
+def _crc16_xmodem(data: bytes | bytearray | memoryview) -> int:
+    """Get CRC16-XMODEM for data."""
+    return crc_hqx(data, 0)
+
+
 ###############################################################################
 # Enum: ESerialFrameHdr
 ###############################################################################
@@ -27,6 +40,12 @@ class ESerialFrameHdr(Enum):
     FOOT = 2
 
 
+# enum values resolved once, used in hot paths
+_SOF = ESerialFrameHdr.SOF.value
+_HDR_LEN = ESerialFrameHdr.END.value
+_FOOT_LEN = ESerialFrameHdr.FOOT.value
+
+
 ###############################################################################
 # Class: SerialFrame
 ###############################################################################
@@ -39,26 +58,28 @@ class SerialFrame(ICommFrame):
         """Initialize the NxScope serial protocol parser."""
         super().__init__()
 
-        self._crc16_func = crcmod.predefined.mkCrcFun("xmodem")
-
     @property
     def hdr_len(self) -> int:
         """Get the size of a header."""
-        return ESerialFrameHdr.END.value
+        return _HDR_LEN
 
     @property
     def foot_len(self) -> int:
         """Get the size of a footer."""
-        return ESerialFrameHdr.FOOT.value
+        return _FOOT_LEN
 
-    def hdr_find(self, data: bytes) -> int:
+    def hdr_find(
+        self, data: bytes | bytearray, start: int = 0, end: int | None = None
+    ) -> int:
         """Find a header in bytes.
 
         :param data: bytes to search
+        :param start: search start index
+        :param end: search end index
         """
-        return data.find(bytes([ESerialFrameHdr.SOF.value]))
+        return data.find(_SOF_BYTES, start, end)
 
-    def hdr_decode(self, data: bytes) -> DParseHdr:
+    def hdr_decode(self, data: bytes | bytearray | memoryview) -> DParseHdr:
         """Decode a header from bytes.
 
         :param data: bytes to decode
@@ -68,18 +89,13 @@ class SerialFrame(ICommFrame):
             return DParseHdr(err=EParseError.HDR)
 
         # not sufficient data for hdr
-        if len(data) < self.hdr_len:
+        if len(data) < _HDR_LEN:
             return DParseHdr(err=EParseError.HDR)
 
-        # crop data
-        data = data[: self.hdr_len]
-
         # hdr always encoded in little-endian
-        fmt = "<BHB"
-
-        sof, flen, _id = struct.unpack(fmt, data[: ESerialFrameHdr.END.value])
+        sof, flen, _id = _ST_HDR.unpack_from(data)
 
-        if sof != ESerialFrameHdr.SOF.value:
+        if sof != _SOF:
             logger.error("invalid sof = %s", hex(sof))
             return DParseHdr(err=EParseError.HDR)
 
@@ -91,12 +107,12 @@ class SerialFrame(ICommFrame):
 
         return DParseHdr(fid=fid, flen=flen)
 
-    def foot_validate(self, data: bytes) -> bool:
+    def foot_validate(self, data: bytes | bytearray | memoryview) -> bool:
         """Validate a frame footer.
 
         :param data: bytes to validate
         """
-        crc = self._crc16_func(data)
+        crc = _crc16_xmodem(data)
         if crc != 0:
             logger.error("invalid crc16 = %s", hex(crc))
             return False
@@ -111,10 +127,10 @@ class SerialFrame(ICommFrame):
         if hdr.err is not EParseError.NOERR:
             return DParseFrame(err=hdr.err)
 
-        if self.foot_validate(data[: hdr.flen]) is False:
+        if not self.foot_validate(memoryview(data)[: hdr.flen]):
             return DParseFrame(err=EParseError.FOOT)
 
-        data = data[ESerialFrameHdr.END.value : hdr.flen - 2]
+        data = data[_HDR_LEN : hdr.flen - _FOOT_LEN]
 
         return DParseFrame(fid=hdr.fid, data=data)
 
@@ -129,16 +145,18 @@ class SerialFrame(ICommFrame):
         if data is not None:
             frame_len += len(data)
 
+        # frame is built in place
+        _bytes = bytearray(frame_len)
+
         # encode header - always encoded in little-endian
-        fmt = "<BHB"
-        _bytes = struct.pack(fmt, ESerialFrameHdr.SOF.value, frame_len, fid)
+        _ST_HDR.pack_into(_bytes, 0, _SOF, frame_len, fid)
 
         # optional data
         if data is not None:
-            _bytes += data
+            _bytes[_HDR_LEN : frame_len - _FOOT_LEN] = data
 
         # crc16 - always big endian
-        crc = self._crc16_func(_bytes)
-        _bytes += struct.pack(">H", crc)
+        crc = _crc16_xmodem(memoryview(_bytes)[: frame_len - _FOOT_LEN])
+        _ST_CRC.pack_into(_bytes, frame_len - _FOOT_LEN, crc)
 
-        return _bytes
+        return bytes(_bytes)
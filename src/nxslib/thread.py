@@ -1,11 +1,14 @@
 """The Nxslib common thread logic."""
 
-import threading
+from threading import Event, Thread
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
+# backoff used when target reports no work for too many calls
+_IDLE_BACKOFF = 1e-6
+
 ###############################################################################
 # Class: ThreadCommon
 ###############################################################################
@@ -16,39 +19,69 @@ class ThreadCommon:
 
     def __init__(
         self,
-        target: "Callable[[], None]",
+        target: "Callable[[], bool | None]",
         init: "Callable[[], None] | None" = None,
         final: "Callable[[], None] | None" = None,
         name: str | None = None,
+        idle_period: float | None = None,
+        idle_threshold: int = 128,
+        idle_backoff: float = _IDLE_BACKOFF,
     ) -> None:
         """Initialize common thread.
 
         :param: callable object to be invoked
+        :param idle_period: optional wait between target calls,
+          interrupted immediately by a stop request
+        :param idle_threshold: number of calls where target returns False
+          (no work done) before the thread backs off for a moment
+        :param idle_backoff: how long the thread backs off in seconds
         """
-        assert callable(target)
-        if init:
-            assert callable(init)
-        if final:
-            assert callable(final)
+        if not callable(target):
+            raise TypeError("target must be callable")
+        if init is not None and not callable(init):
+            raise TypeError("init must be callable")
+        if final is not None and not callable(final):
+            raise TypeError("final must be callable")
         self._target = target
         self._init = init
         self._final = final
-        self._thrd: threading.Thread | None = None
-        self._stop_flag = threading.Event()
+        self._thrd: Thread | None = None
+        # plain flag for the busy loop, event for the idle wait
+        self._stop_req = False
+        self._stop_flag = Event()
         self._name = name
-
-    def _stop_is_set(self) -> bool:
-        """Return stop flag state."""
-        return self._stop_flag.is_set()
+        self._idle_period = idle_period
+        self._idle_threshold = idle_threshold
+        self._idle_backoff = idle_backoff
 
     def _thread_loop(self) -> None:
         # one time initialization
         if self._init:
             self._init()
 
+        # bind hot loop references to locals
+        target = self._target
+        idle_period = self._idle_period
+
         # thread loop
-        while not self._stop_is_set():
-            self._target()
+        stop_wait = self._stop_flag.wait
+        if idle_period is None:
+            idle_threshold = self._idle_threshold
+            idle_backoff = self._idle_backoff
+            spin = 0
+            while not self._stop_req:
+                # spin while target does work, then back off
+                if target() is False:
+                    spin += 1
+                    if spin >= idle_threshold:
+                        stop_wait(idle_backoff)
+                        spin = 0
+                else:
+                    spin = 0
+        else:
+            # wait on stop flag instead of sleep, so stop is not delayed
+            while not stop_wait(idle_period):
+                target()
 
         # final logic
         if self._final:
@@ -56,10 +89,12 @@ class ThreadCommon:
 
     def _stop_clear(self) -> None:
         """Clear stop flag."""
+        self._stop_req = False
         self._stop_flag.clear()
 
     def stop_set(self) -> None:
         """Set stop flag."""
+        self._stop_req = True
         self._stop_flag.set()
 
     def thread_is_alive(self) -> bool:
@@ -87,7 +122,8 @@ class ThreadCommon:
         """Start thread."""
         if not self._thrd:
             self._stop_clear()
-            self._thrd = threading.Thread(
-                target=self._thread_loop, name=self._name
+            # daemon thread - a loop left running does not block exit
+            self._thrd = Thread(
+                target=self._thread_loop, name=self._name, daemon=True
             )
             self._thrd.start()
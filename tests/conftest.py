@@ -0,0 +1,9 @@
+import pytest  # type: ignore
+
+from nxslib.proto.parse import Parser
+
+
+# parser keeps no connection state, one instance serves all handler tests
+@pytest.fixture(scope="session")
+def parser():
+    return Parser()
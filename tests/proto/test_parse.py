@@ -1,3 +1,5 @@
+import pytest  # type: ignore
+
 from nxslib.dev import Device, DeviceChannel, EDeviceChannelType
 from nxslib.proto.iframe import DParseFrame, EParseId, ICommFrame
 from nxslib.proto.iparse import DsfmtItem, EParseDataType
@@ -28,12 +30,26 @@ def test_nxslibparse_frame():
     assert parse.frame_enable((0, False), 3) is not None
     assert parse.frame_enable([False, True, False], 3) is not None
     assert parse.frame_enable([False, False, False], 3) is not None
+    assert parse.frame_enable(b"\x00\x05\x00", 3) == parse.frame_enable(
+        [False, True, False], 3
+    )
+    assert parse.frame_enable(bytearray(b"\x02\x02"), 2) == parse.frame_enable(
+        [True, True], 2
+    )
 
     # valid div frame
     assert parse.frame_div((0, 0), 3) is not None
     assert parse.frame_div([2, 2, 0], 3) is not None
     assert parse.frame_div([3, 3, 3], 3) is not None
 
+    # one value per channel required
+    with pytest.raises(ValueError, match="expected 4 enable values, got 2"):
+        parse.frame_enable([True, False], 4)
+    with pytest.raises(ValueError):
+        parse.frame_enable(b"\x01\x00", 4)
+    with pytest.raises(ValueError, match="expected 4 div values, got 2"):
+        parse.frame_div([1, 2], 4)
+
 
 def test_nxslibparse_decode():
     parse = Parser()
@@ -61,6 +77,13 @@ def test_nxslibparse_decode():
     frame = DParseFrame(EParseId.ACK, b"\x00\x00\x00\x01")
     assert parse.frame_ack_decode(frame) is not None
 
+    # plain int frame IDs
+    frame = DParseFrame(int(EParseId.ACK), b"\x00\x00\x00\x00")
+    assert parse.frame_is_ack(frame) is True
+    assert parse.frame_ack_decode(frame) is not None
+    frame = DParseFrame(int(EParseId.STREAM), b"")
+    assert parse.frame_is_stream(frame) is True
+
 
 def test_nxslibparse_stream():
     parse = Parser()
@@ -173,6 +196,65 @@ def test_nxslibparse_stream():
     assert sdata.samples[0].data == ("a\x00",)
     assert sdata.samples[0].meta == ()
 
+    # many samples from one channel
+    data = b"\x00\x03a\x00\x01\x03b\x00\x02\x03c\x00\x03"
+    frame = DParseFrame(EParseId.STREAM, data)
+    sdata = parse.frame_stream_decode(frame, d)
+    assert len(sdata.samples) == 3
+    assert [s.chan for s in sdata.samples] == [3, 3, 3]
+    assert [s.data for s in sdata.samples] == [
+        ("a\x00",),
+        ("b\x00",),
+        ("c\x00",),
+    ]
+    assert [s.meta for s in sdata.samples] == [(1,), (2,), (3,)]
+
+    # samples from many channels
+    data = b"\x00\x03a\x00\x01\x01\x02\x03b\x00\x02\x00\x02\x05"
+    frame = DParseFrame(EParseId.STREAM, data)
+    sdata = parse.frame_stream_decode(frame, d)
+    assert len(sdata.samples) == 5
+    assert [s.chan for s in sdata.samples] == [3, 1, 3, 0, 2]
+    assert [s.data for s in sdata.samples] == [
+        ("a\x00",),
+        (2,),
+        ("b\x00",),
+        (),
+        (),
+    ]
+    assert [s.meta for s in sdata.samples] == [(1,), (), (2,), (), (5,)]
+
+
+def test_nxslibparse_stream_many():
+    parse = Parser()
+    chans = [
+        DeviceChannel(
+            0, EDeviceChannelType.UINT8.value, 1, "chan0", mlen=0, func=None
+        ),
+        DeviceChannel(
+            1, EDeviceChannelType.UINT8.value, 1, "chan1", mlen=0, func=None
+        ),
+    ]
+    d = Device(2, 0b11, 0, chans)
+
+    frames = [
+        DParseFrame(EParseId.STREAM, b"\x00\x00\x01\x00\x02"),
+        DParseFrame(EParseId.ACK, b"\x00\x00\x00\x00"),
+        None,
+        DParseFrame(EParseId.STREAM, b""),
+        DParseFrame(EParseId.STREAM, b"\x01\x01\x03\x00\x04"),
+    ]
+    sdata = parse.frame_stream_decode_many(frames, d)
+    assert len(sdata) == 2
+    assert sdata[0].flags == 0
+    assert [s.data for s in sdata[0].samples] == [(1,), (2,)]
+    assert sdata[1].flags == 1
+    assert [s.chan for s in sdata[1].samples] == [1, 0]
+    assert [s.data for s in sdata[1].samples] == [(3,), (4,)]
+
+    # no frames
+    assert parse.frame_stream_decode_many([], d) == []
+
 
 def test_nxslibparse_stream_user():
     user = {
@@ -267,3 +349,52 @@ def test_nxslibparse_stream_user():
     assert sdata.samples[0].mlen == 1
     assert sdata.samples[0].data == (b"a", b"b", 0, 0)
     assert sdata.samples[0].meta == (1,)
+
+
+def test_nxslibparse_stream_raw_num():
+    chans = [
+        DeviceChannel(
+            0, EDeviceChannelType.B8.value, 1, "chan0", mlen=0, func=None
+        ),
+        DeviceChannel(
+            1, EDeviceChannelType.UB8.value, 2, "chan1", mlen=0, func=None
+        ),
+    ]
+    d = Device(2, 0b11, 0, chans)
+    data = b"\x00\x00\x80\x01\x01\x00\x02\x00\x04"
+
+    # scaled data
+    parse = Parser()
+    frame = DParseFrame(EParseId.STREAM, data)
+    sdata = parse.frame_stream_decode(frame, d)
+    assert sdata.samples[0].data == (1.5,)
+    assert sdata.samples[1].data == (2.0, 4.0)
+
+    # raw data
+    parse = Parser(raw_num=True)
+    frame = DParseFrame(EParseId.STREAM, data)
+    sdata = parse.frame_stream_decode(frame, d)
+    assert sdata.samples[0].data == (384,)
+    assert sdata.samples[1].data == (512, 1024)
+
+
+def test_nxslibparse_stream_raw_char():
+    chans = [
+        DeviceChannel(
+            0, EDeviceChannelType.CHAR.value, 3, "chan0", mlen=0, func=None
+        ),
+    ]
+    d = Device(1, 0b11, 0, chans)
+    data = b"\x00\x00ab\x00"
+
+    # decoded data
+    parse = Parser()
+    frame = DParseFrame(EParseId.STREAM, data)
+    sdata = parse.frame_stream_decode(frame, d)
+    assert sdata.samples[0].data == ("ab\x00",)
+
+    # raw data
+    parse = Parser(raw_char=True)
+    frame = DParseFrame(EParseId.STREAM, data)
+    sdata = parse.frame_stream_decode(frame, d)
+    assert sdata.samples[0].data == (b"ab\x00",)
@@ -7,6 +7,7 @@ from nxslib.proto.iparse import (
     DsfmtItem,
     EParseDataType,
     EParseIdSetFlags,
+    dsfmt_get,
 )
 from nxslib.proto.iparserecv import ParseRecvCb
 from nxslib.proto.parse import Parser
@@ -90,12 +91,24 @@ def test_nxslibparserecv_fames():
     _bytes = parser.frame_start(True)
     assert recv.recv_handle(_bytes) is None
 
+    # valid frame inside a larger buffer
+    starts = []
+    recv_cb = ParseRecvCb(
+        cb_cmninfo, cb_chinfo, cb_enable, cb_div, starts.append
+    )
+    recv2 = ParseRecv(recv_cb, SerialFrame)
+    _bytes = b"\x55\x00" + parser.frame_start(True) + b"\x55"
+    assert recv2.recv_handle(_bytes, 2, len(_bytes) - 1) is None
+    assert starts == [b"\x01"]
+    assert recv2.recv_handle(_bytes, 2, 6) is None
+    assert recv2.recv_handle(_bytes, len(_bytes) - 1) is None
+    assert len(starts) == 1
+
     frame = SerialFrame()
 
     # invalid data
-    _bytes = frame.frame_create(EParseId.CMNINFO, None)
-    _bytes = list(_bytes)  # invalid footer
-    _bytes[-1] = _bytes[-1] + 1
+    _bytes = bytearray(frame.frame_create(EParseId.CMNINFO, None))
+    _bytes[-1] += 1  # invalid footer
     _bytes = bytes(_bytes)
     assert recv.recv_handle(_bytes) is None
     _bytes = frame.frame_create(EParseId.CMNINFO, b"\x00")
@@ -121,6 +134,51 @@ def test_nxslibparserecv_fames():
         recv.recv_handle(_bytes)
 
 
+def test_nxslibparserecv_feed():
+    frames = []
+
+    def cb_frame(data):
+        frames.append(data)
+
+    recv_cb = ParseRecvCb(cb_frame, cb_frame, cb_frame, cb_frame, cb_frame)
+    recv = ParseRecv(recv_cb, SerialFrame)
+    parser = Parser(SerialFrame)
+
+    # no data
+    assert recv.recv_feed(b"") == 0
+
+    # garbage only
+    assert recv.recv_feed(b"\x00\x01\x02\x03\x04\x05\x06") == 0
+
+    # many frames in one chunk with garbage between frames
+    _bytes = parser.frame_cmninfo()
+    _bytes += b"\x00\x01"
+    _bytes += parser.frame_chinfo(1)
+    _bytes += parser.frame_start(True)
+    assert recv.recv_feed(_bytes) == 3
+    assert frames == [b"", b"\x01", b"\x01"]
+    frames.clear()
+
+    # frame split across many chunks
+    _bytes = parser.frame_div([2, 2, 0], 3)
+    assert recv.recv_feed(_bytes[:2]) == 0
+    assert recv.recv_feed(_bytes[2:7]) == 0
+    assert recv.recv_feed(_bytes[7:]) == 1
+    assert frames == [b"\x01\x00\x02\x02\x00"]
+    frames.clear()
+
+    # invalid header, too short header and invalid footer are skipped
+    frame = SerialFrame()
+    _bytes = bytes([0x55, 0x06, 0x00, 0xFF, 0x00, 0x00])
+    _bytes += bytes([0x55, 0x00, 0x00, 0x01, 0x00, 0x00])
+    invalid = bytearray(frame.frame_create(EParseId.CMNINFO, None))
+    invalid[-1] ^= 0xFF
+    _bytes += invalid
+    _bytes += parser.frame_start(False)
+    assert recv.recv_feed(_bytes) == 1
+    assert frames == [b"\x00"]
+
+
 def test_nxslibparserecv_decode():
     recv_cb = ParseRecvCb(cb_cmninfo, cb_chinfo, cb_enable, cb_div, cb_start)
     recv = ParseRecv(recv_cb, SerialFrame)
@@ -181,6 +239,13 @@ def test_nxslibparserecv_encode():
     recv_cb = ParseRecvCb(cb_cmninfo, cb_chinfo, cb_enable, cb_div, cb_start)
     recv = ParseRecv(recv_cb, SerialFrame)
 
+    # ACK frames
+    parse = Parser()
+    frame = parse.frame.frame_decode(recv.frame_ack_encode(0))
+    assert parse.frame_ack_decode(frame).state is True
+    frame = parse.frame.frame_decode(recv.frame_ack_encode(-5))
+    assert parse.frame_ack_decode(frame).retcode == -5
+
     # empty data
     samples = []
     assert recv.frame_stream_encode(samples) is None
@@ -203,6 +268,38 @@ def test_nxslibparserecv_encode():
     ]
     assert recv.frame_stream_encode(samples) is not None
 
+    # scaled samples
+    samples = [
+        DParseStreamData(
+            0, EDeviceChannelType.B16.value, 2, 0, (1.5, -2.25), ()
+        )
+    ]
+    frame = recv.frame_stream_encode(samples)
+    assert frame is not None
+    chans = [
+        DeviceChannel(
+            0, EDeviceChannelType.B16.value, 2, "chan0", mlen=0, func=None
+        ),
+    ]
+    dev = Device(1, 0, 0, chans)
+    parse = Parser()
+    sdata = parse.frame_stream_decode(parse.frame.frame_decode(frame), dev)
+    assert sdata.samples[0].data == (1.5, -2.25)
+
+    # not representable values are rounded to the nearest fixed-point value
+    samples = [
+        DParseStreamData(
+            0, EDeviceChannelType.B16.value, 2, 0, (2.3, -2.3), ()
+        )
+    ]
+    frame = recv.frame_stream_encode(samples)
+    sdata = parse.frame_stream_decode(parse.frame.frame_decode(frame), dev)
+    scale = dsfmt_get(EDeviceChannelType.B16.value).scale
+    assert sdata.samples[0].data == (
+        round(2.3 * scale) / scale,
+        round(-2.3 * scale) / scale,
+    )
+
     # samples with no vect and no meta
     samples = [DParseStreamData(0, 1, 0, 0, (), ())]
     assert recv.frame_stream_encode(samples) is None
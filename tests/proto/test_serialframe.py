@@ -59,6 +59,8 @@ def test_nxslibproto_init():
     _id = 1
     data = b"abblllaa"
     frame_encoded = proto.frame_create(_id, data)
+    # crc16 xmodem
+    assert frame_encoded == bytes.fromhex("550e00016162626c6c6c6161bfa3")
     # decode frame
     frame_decoded = proto.frame_decode(frame_encoded)
     assert frame_decoded.fid == _id
@@ -76,25 +78,18 @@ def test_nxslibproto_init():
     data = b"abblllaa"
 
     # invalid crc
-    frame_encoded = proto.frame_create(_id, data)
-    frame_encoded = list(frame_encoded)
+    frame_encoded = bytearray(proto.frame_create(_id, data))
     frame_encoded[-1] = 0xFF
-    frame_encoded = bytes(frame_encoded)
-    frame_decoded = proto.frame_decode(frame_encoded)
+    frame_decoded = proto.frame_decode(bytes(frame_encoded))
     assert frame_decoded.err is EParseError.FOOT
 
     # no crc
-    frame_encoded = proto.frame_create(_id, data)
-    frame_encoded = list(frame_encoded)
-    frame_encoded = frame_encoded[:-2]
-    frame_encoded = bytes(frame_encoded)
+    frame_encoded = proto.frame_create(_id, data)[:-2]
     frame_decoded = proto.frame_decode(frame_encoded)
     assert frame_decoded.err is EParseError.FOOT
 
     # invalid sof
-    frame_encoded = proto.frame_create(_id, data)
-    frame_encoded = list(frame_encoded)
+    frame_encoded = bytearray(proto.frame_create(_id, data))
     frame_encoded[0] = 0x00
-    frame_encoded = bytes(frame_encoded)
-    frame_decoded = proto.frame_decode(frame_encoded)
+    frame_decoded = proto.frame_decode(bytes(frame_encoded))
     assert frame_decoded.err is EParseError.HDR
@@ -1,3 +1,6 @@
+from operator import attrgetter
+from typing import NamedTuple
+
 import pytest  # type: ignore
 
 from nxslib.comm import CommHandler
@@ -6,6 +9,17 @@ from nxslib.intf.dummy import DummyDev
 from nxslib.proto.iparse import EParseDataType
 from nxslib.proto.parse import Parser
 
+# expected dummy device payloads
+CH6_DATA = ("hello" + "\0" * 59,)
+CH8_META = tuple(b"hello" + b"\x00" * 11)
+
+
+def _assert_chan_stream(samples, **expected):
+    # all samples must match, compare lists so a failure shows which
+    get = attrgetter(*expected)
+    want = tuple(expected.values())
+    assert [get(x) for x in samples] == [want] * len(samples)
+
 
 def test_nxslib_init():
     i = DummyDev()
@@ -15,11 +29,26 @@ def test_nxslib_init():
     assert isinstance(comm, CommHandler)
 
 
-@pytest.fixture
-def comm():
+@pytest.fixture(scope="module")
+def comm_shared(parser):
     i = DummyDev()
-    p = Parser()
-    return CommHandler(i, p)
+    return CommHandler(i, parser)
+
+
+@pytest.fixture
+def comm(comm_shared):
+    yield comm_shared
+    # leave the shared handler disconnected for the next test
+    comm_shared.disconnect()
+
+
+@pytest.fixture(scope="module")
+def comm_connected(parser):
+    # separate instance so the connect tests can't drop this connection
+    comm = CommHandler(DummyDev(), parser)
+    comm.connect()
+    yield comm
+    comm.disconnect()
 
 
 def test_nxslib_connect(comm):
@@ -43,6 +72,21 @@ def test_nxslib_connect(comm):
     assert comm.dev is None
 
 
+@pytest.mark.parametrize(
+    "func, args, exc",
+    [
+        ("ch_enable", ("1",), TypeError),
+        ("ch_disable", ("1",), TypeError),
+        ("ch_divider", ("1", 0), TypeError),
+        ("ch_divider", (1, 1000), ValueError),
+    ],
+)
+def test_nxslib_channels_invalid(comm_connected, func, args, exc):
+    # invalid interface use
+    with pytest.raises(exc):
+        getattr(comm_connected, func)(*args)
+
+
 def test_nxslib_channels(comm):
     # not connected should raise error
     with pytest.raises(AssertionError):
@@ -54,26 +98,17 @@ def test_nxslib_channels(comm):
     # default configuration
     comm.channels_default_cfg()
     comm.channels_write()
-    for chan in range(comm.dev.data.chmax):
-        assert comm.ch_is_enabled(chan) is False
-        assert comm.ch_div_get(chan) == 0
-
-    # invalid interface use
-    with pytest.raises(TypeError):
-        comm.ch_enable("1")
-    with pytest.raises(TypeError):
-        comm.ch_disable("1")
-    with pytest.raises(TypeError):
-        comm.ch_divider("1", 0)
-    with pytest.raises(ValueError):
-        comm.ch_divider(1, 1000)
+    chans = range(comm.dev.data.chmax)
+    is_en = comm.ch_is_enabled
+    div_get = comm.ch_div_get
+    assert [is_en(chan) for chan in chans] == [False] * len(chans)
+    assert [div_get(chan) for chan in chans] == [0] * len(chans)
 
     # enable all channels
     comm.ch_enable_all()
     comm.channels_write()
-    for chan in range(comm.dev.data.chmax):
-        assert comm.ch_is_enabled(chan) is True
-        assert comm.ch_div_get(chan) == 0
+    assert [is_en(chan) for chan in chans] == [True] * len(chans)
+    assert [div_get(chan) for chan in chans] == [0] * len(chans)
 
     # enable all once again
     comm.ch_enable_all()
@@ -87,13 +122,13 @@ def test_nxslib_channels(comm):
     assert comm.ch_is_enabled(2) is True
     assert comm.ch_is_enabled(3) is True
 
-    # disable channels
+    # disable channels, requested twice before a single write - only the
+    # final configuration is sent
     comm.ch_disable([1, 3])
-    comm.channels_write()
-
-    # once again
     comm.ch_disable([1, 3])
     comm.channels_write()
+    assert comm.ch_is_enabled(1) is False
+    assert comm.ch_is_enabled(3) is False
 
     # divider
     comm.ch_divider(1, 1)
@@ -114,15 +149,82 @@ def test_nxslib_channels(comm):
     comm.disconnect()
 
 
-def test_nxslib_stream_ch1(comm):
+class StreamSpec(NamedTuple):
+    # sample fields that are the same for all samples
+    fixed: dict
+    # sample field with a counter (1, 2, 3...) or None
+    counter: str | None
+    # stop stream before disconnect or disconnect while streaming
+    stop: bool
+
+
+STREAM_SPECS = [
+    pytest.param(
+        1,
+        StreamSpec(
+            {"dtype": EParseDataType.NUM, "vdim": 1, "mlen": 0, "meta": ()},
+            "data",
+            False,
+        ),
+        id="ch1",
+    ),
+    pytest.param(
+        6,
+        StreamSpec(
+            {
+                "dtype": EParseDataType.CHAR,
+                "vdim": 64,
+                "mlen": 0,
+                "data": CH6_DATA,
+                "meta": (),
+            },
+            None,
+            True,
+        ),
+        id="ch6",
+    ),
+    pytest.param(
+        7,
+        StreamSpec(
+            {
+                "dtype": EParseDataType.NUM,
+                "vdim": 3,
+                "mlen": 1,
+                "data": (1, 0, -1),
+            },
+            "meta",
+            True,
+        ),
+        id="ch7",
+    ),
+    pytest.param(
+        8,
+        StreamSpec(
+            {
+                "dtype": EParseDataType.NONE,
+                "vdim": 0,
+                "mlen": 16,
+                "data": (),
+                "meta": CH8_META,
+            },
+            None,
+            True,
+        ),
+        id="ch8",
+    ),
+]
+
+
+@pytest.mark.parametrize("chan, spec", STREAM_SPECS)
+def test_nxslib_stream_chan(comm, chan, spec):
     # connect
     comm.connect()
 
     # default configuration
     comm.channels_default_cfg()
 
-    # enable channel 1
-    comm.ch_enable(1)
+    # enable channel
+    comm.ch_enable(chan)
     comm.channels_write()
 
     # no stream - should be no data
@@ -136,19 +238,19 @@ def test_nxslib_stream_ch1(comm):
     assert data is not None
     assert data.flags == 0
 
-    # should mach dummy dev channel 1
-    i = 1.0
-    for x in data.samples:
-        assert x.chan == 1
-        assert x.dtype == EParseDataType.NUM
-        assert x.vdim == 1
-        assert x.mlen == 0
-        assert isinstance(x.data, tuple)
-        assert x.data == (i,)
-        i += 1.0
-        assert x.meta == ()
+    # should mach dummy dev channel
+    samples = data.samples
+    _assert_chan_stream(samples, chan=chan, **spec.fixed)
+    if spec.counter:
+        assert [getattr(x, spec.counter) for x in samples] == [
+            (i,) for i in range(1, len(samples) + 1)
+        ]
 
-    # do not stop stream but disconnect
+    # stop stream or disconnect while streaming
+    if spec.stop:
+        comm.stream_stop()
+
+    # disconnect
     comm.disconnect()
 
 
@@ -175,160 +277,15 @@ def test_nxslib_stream_ch1ch2(comm):
     assert data.flags == 0
 
     # we expect data from ch1 and ch2
-    ch1_cntr = 0
-    ch2_cntr = 0
-    for x in data.samples:
-        if x.chan == 1:
-            ch1_cntr += 1
-        if x.chan == 2:
-            ch2_cntr += 1
-
-    assert ch1_cntr > 0
-    assert ch2_cntr > 0
+    assert {x.chan for x in data.samples} == {1, 2}
 
     # do not stop stream but disconnect
     comm.disconnect()
 
 
-def test_nxslib_stream_ch6(comm):
-    # connect again
-    comm.connect()
-
-    # default configuration
-    comm.channels_default_cfg()
-
-    # enable channel 6
-    comm.ch_enable(6)
-    comm.channels_write()
-
-    # no stream - should be no data
-    assert comm.stream_data() is None
-
-    # start stream
-    comm.stream_start()
-
-    # get data
-    data = comm.stream_data()
-    assert data is not None
-    assert data.flags == 0
-
-    # should mach dummy dev channel 6 - we should capture at least one message
-    for x in data.samples:
-        assert x.chan == 6
-        assert x.dtype == EParseDataType.CHAR
-        assert x.vdim == 64
-        assert x.mlen == 0
-        assert isinstance(x.data[0], str)
-        assert x.data == ("hello" + "\0" * 59,)
-        assert x.meta == ()
-
-    # stop stream
-    comm.stream_stop()
-
-    # disconnect
-    comm.disconnect()
-
-
-def test_nxslib_stream_ch7(comm):
-    # connect again
-    comm.connect()
-
-    # default configuration
-    comm.channels_default_cfg()
-
-    # enable channel 7
-    comm.ch_enable(7)
-    comm.channels_write()
-
-    # no stream - should be no data
-    assert comm.stream_data() is None
-
-    # start stream
-    comm.stream_start()
-
-    # get data
-    data = comm.stream_data()
-    assert data is not None
-    assert data.flags == 0
-
-    # should mach dummy dev channel 7
-    i = 1
-    for x in data.samples:
-        assert x.chan == 7
-        assert x.dtype == EParseDataType.NUM
-        assert x.vdim == 3
-        assert x.mlen == 1
-        assert isinstance(x.data, tuple)
-        assert x.data == (1, 0, -1)
-        assert x.meta == (i,)
-        i += 1
-
-    # stop stream
-    comm.stream_stop()
-
-    # disconnect
-    comm.disconnect()
-
-
-def test_nxslib_stream_ch8(comm):
-    # connect again
-    comm.connect()
-
-    # default configuration
-    comm.channels_default_cfg()
-
-    # enable channel 8
-    comm.ch_enable(8)
-    comm.channels_write()
-
-    # no stream - should be no data
-    assert comm.stream_data() is None
-
-    # start stream
-    comm.stream_start()
-
-    # get data
-    data = comm.stream_data()
-    assert data is not None
-    assert data.flags == 0
-
-    # should mach dummy dev channel 7
-    for x in data.samples:
-        assert x.chan == 8
-        assert x.dtype == EParseDataType.NONE
-        assert x.vdim == 0
-        assert x.mlen == 16
-        assert x.data == ()
-        assert x.meta == (
-            104,
-            101,
-            108,
-            108,
-            111,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
-        )  # hello
-
-    # stop stream
-    comm.stream_stop()
-
-    # disconnect
-    comm.disconnect()
-
-
-def test_nxslib_nodiv(comm):
+def test_nxslib_nodiv(parser):
     i = DummyDev(flags=EDeviceFlags.ACK_SUPPORT.value)
-    p = Parser()
-    comm = CommHandler(i, p)
+    comm = CommHandler(i, parser)
 
     # connect
     comm.connect()
@@ -347,10 +304,9 @@ def test_nxslib_nodiv(comm):
     comm.disconnect()
 
 
-def test_nxslib_noack(comm):
+def test_nxslib_noack(parser):
     i = DummyDev(flags=EDeviceFlags.DIVIDER_SUPPORT.value)
-    p = Parser()
-    comm = CommHandler(i, p)
+    comm = CommHandler(i, parser)
 
     # connect
     comm.connect()
@@ -4,52 +4,116 @@ import threading
 import pytest  # type: ignore
 
 from nxslib.intf.dummy import DummyDev
-from nxslib.nxscope import NxscopeHandler
-from nxslib.proto.parse import Parser
+from nxslib.nxscope import DNxscopeStream, NxscopeHandler
 
+# how long to wait before deciding that no data is coming
+EMPTY_WAIT = 0.1
+# upper bound for data that must arrive, a stalled stream fails the test
+# instead of hanging it
+DATA_WAIT = 1.0
 
-def test_nxscope_connect():
+
+@pytest.fixture(scope="module")
+def nxscope_shared(parser):
     intf = DummyDev()
-    parse = Parser()
-    nxscope = NxscopeHandler(intf, parse)
+    return NxscopeHandler(intf, parser)
 
-    # connect
+
+@pytest.fixture
+def nxscope_fresh(nxscope_shared):
+    yield nxscope_shared
+    # leave the shared handler disconnected for the next test
+    nxscope_shared.disconnect()
+
+
+@pytest.fixture(scope="module")
+def nxscope_connected(parser):
+    # separate instance so the connect tests can't drop this connection
+    nxscope = NxscopeHandler(DummyDev(), parser)
     nxscope.connect()
+    yield nxscope
+    nxscope.disconnect()
+
+
+@pytest.fixture
+def nxscope(nxscope_connected):
+    # start each test from the default channels configuration
+    nxscope_connected.channels_default_cfg(writenow=True)
+    return nxscope_connected
+
+
+def test_nxscope_connect(nxscope_fresh):
+    # connect
+    nxscope_fresh.connect()
     # connect once agian
-    nxscope.connect()
+    nxscope_fresh.connect()
 
-    assert nxscope.dev is not None
-    for chan in range(nxscope.dev.data.chmax):
-        assert nxscope.dev_channel_get(chan) is not None
+    assert nxscope_fresh.dev is not None
+    chan_get = nxscope_fresh.dev_channel_get
+    chans = range(nxscope_fresh.dev.data.chmax)
+    assert None not in [chan_get(ch) for ch in chans]
 
     # disconnect
-    nxscope.disconnect()
+    nxscope_fresh.disconnect()
     # disconnect once agian
-    nxscope.disconnect()
+    nxscope_fresh.disconnect()
 
-    assert nxscope.dev is None
+    assert nxscope_fresh.dev is None
     with pytest.raises(AssertionError):
-        _ = nxscope.dev_channel_get(0)
+        _ = nxscope_fresh.dev_channel_get(0)
 
 
-def test_nxscope_stream():
-    intf = DummyDev()
-    parse = Parser()
-    nxscope = NxscopeHandler(intf, parse)
+def test_nxscope_stream_idempotent(nxscope):
+    # repeated start/stop requests are ignored
+    nxscope.stream_start()
+    nxscope.stream_start()
+    nxscope.stream_stop()
+    nxscope.stream_stop()
 
-    # connect
-    nxscope.connect()
 
-    # start stream
-    nxscope.stream_start()
-    # start stream once again
+def test_nxscope_stream_bounded(nxscope):
+    q0 = nxscope.stream_sub(0, maxsize=2)
+
+    nxscope.ch_enable(0)
     nxscope.stream_start()
 
-    # stop stream
-    nxscope.stream_stop()
-    # stop stream once again
+    # wait for data but don't consume it, the producer drops the oldest
+    assert q0.get(timeout=DATA_WAIT)
+    threading.Event().wait(EMPTY_WAIT)
+
+    # overflow doesn't stop the stream, samples keep arriving
+    for _ in range(10):
+        assert q0.get(timeout=DATA_WAIT)
+
+    # overflow again before stop
+    threading.Event().wait(EMPTY_WAIT)
     nxscope.stream_stop()
+    nxscope.stream_unsub(q0)
 
+    assert q0.qsize() == 2
+
+
+def test_nxscope_sub_put_drop_oldest():
+    que = queue.Queue(2)
+    batches = [[DNxscopeStream((i,), ())] for i in range(3)]
+
+    for batch in batches:
+        NxscopeHandler._sub_put(que, batch)
+
+    # the oldest batch dropped, order kept
+    assert que.get_nowait() is batches[1]
+    assert que.get_nowait() is batches[2]
+    assert que.empty()
+
+    # unbounded queues keep everything
+    que = queue.SimpleQueue()
+    for batch in batches:
+        NxscopeHandler._sub_put(que, batch)
+
+    assert [que.get_nowait() for _ in batches] == batches
+
+
+def test_nxscope_stream(nxscope):
     # subscribe to streams
     q0_0 = nxscope.stream_sub(0)
     q0_1 = nxscope.stream_sub(0)
@@ -61,14 +125,15 @@ def test_nxscope_stream():
     nxscope.stream_start()
 
     # channels disabled
-    for ch in range(nxscope.dev.data.chmax):
-        assert nxscope._comm.ch_is_enabled(ch) is False
+    is_en = nxscope._comm.ch_is_enabled
+    chans = range(nxscope.dev.data.chmax)
+    assert [is_en(ch) for ch in chans] == [False] * len(chans)
 
     # wait for data but channels no enabled
     with pytest.raises(queue.Empty):
-        _ = q0_0.get(block=True, timeout=0.5)
+        _ = q0_0.get(block=True, timeout=EMPTY_WAIT)
     with pytest.raises(queue.Empty):
-        _ = q0_1.get(block=True, timeout=0.5)
+        _ = q0_1.get(block=True, timeout=EMPTY_WAIT)
 
     # stop stream
     nxscope.stream_stop()
@@ -95,18 +160,16 @@ def test_nxscope_stream():
 
     # wait for data but channels no enabled
     data = q0_0.get(block=True, timeout=1)
-    print(data)
-    print(data[0])
-    assert data
+    assert data and data[0] is not None
+    # stream items print as "data, meta"
+    assert str(data[0]) == repr(data[0]) == f"{data[0].data}, {data[0].meta}"
     data = q0_1.get(block=True, timeout=1)
-    print(data)
-    print(data[0])
-    assert data
+    assert data and data[0] is not None
 
     # get more data
     for _ in range(100):
-        assert q0_0.get(block=True, timeout=1)
-        assert q0_1.get(block=True, timeout=1)
+        assert q0_0.get(timeout=DATA_WAIT)
+        assert q0_1.get(timeout=DATA_WAIT)
 
     # stop stream
     nxscope.stream_stop()
@@ -115,32 +178,13 @@ def test_nxscope_stream():
     nxscope.stream_unsub(q0_0)
     nxscope.stream_unsub(q0_1)
 
-    # disconnect
-    nxscope.disconnect()
-
-
-def test_nxscope_channels_runtime():
-    intf = DummyDev()
-    parse = Parser()
-    nxscope = NxscopeHandler(intf, parse)
-
-    # connect
-    nxscope.connect()
-
-    # force default state
-    nxscope.channels_default_cfg(writenow=True)
 
-    # get device handlers
-    dev0 = nxscope.dev_channel_get(0)
-    dev1 = nxscope.dev_channel_get(1)
-    dev2 = nxscope.dev_channel_get(2)
+def test_nxscope_channels_runtime(nxscope):
+    # channel data is updated in place, bind it once
+    chans = [nxscope.dev_channel_get(ch).data for ch in range(3)]
 
-    assert dev0.data.en is False
-    assert dev1.data.en is False
-    assert dev2.data.en is False
-    assert dev0.data.div == 0
-    assert dev1.data.div == 0
-    assert dev2.data.div == 0
+    assert [c.en for c in chans] == [False, False, False]
+    assert [c.div for c in chans] == [0, 0, 0]
 
     # subscribe to streams
     q0 = nxscope.stream_sub(0)
@@ -154,50 +198,38 @@ def test_nxscope_channels_runtime():
 
     nxscope.channels_default_cfg(writenow=True)
 
-    assert dev0.data.en is False
-    assert dev1.data.en is False
-    assert dev2.data.en is False
-    assert dev0.data.div == 0
-    assert dev1.data.div == 0
-    assert dev2.data.div == 0
+    assert [c.en for c in chans] == [False, False, False]
+    assert [c.div for c in chans] == [0, 0, 0]
 
     # wait for data but channels no enabled
     with pytest.raises(queue.Empty):
-        _ = q0.get(block=True, timeout=0.5)
+        _ = q0.get(block=True, timeout=EMPTY_WAIT)
     with pytest.raises(queue.Empty):
-        _ = q1.get(block=True, timeout=0.5)
+        _ = q1.get(block=True, timeout=EMPTY_WAIT)
     with pytest.raises(queue.Empty):
-        _ = q2.get(block=True, timeout=0.5)
+        _ = q2.get(block=True, timeout=EMPTY_WAIT)
 
-    # reconfig
-    nxscope.ch_enable(0, writenow=True)
+    # reconfig, buffered and written once with the last call
+    nxscope.ch_enable(0)
     nxscope.ch_divider(0, 1, writenow=True)
 
-    assert dev0.data.en is True
-    assert dev1.data.en is False
-    assert dev2.data.en is False
-    assert dev0.data.div == 1
-    assert dev1.data.div == 0
-    assert dev2.data.div == 0
+    assert [c.en for c in chans] == [True, False, False]
+    assert [c.div for c in chans] == [1, 0, 0]
 
     # wait for data
     data = q0.get(block=True, timeout=0.5)
     assert data
     with pytest.raises(queue.Empty):
-        _ = q1.get(block=True, timeout=0.5)
+        _ = q1.get(block=True, timeout=EMPTY_WAIT)
     with pytest.raises(queue.Empty):
-        _ = q2.get(block=True, timeout=0.5)
+        _ = q2.get(block=True, timeout=EMPTY_WAIT)
 
     # reconfig
+    nxscope.ch_divider(1, 5)
     nxscope.ch_enable(1, writenow=True)
-    nxscope.ch_divider(1, 5, writenow=True)
 
-    assert dev0.data.en is True
-    assert dev1.data.en is True
-    assert dev2.data.en is False
-    assert dev0.data.div == 1
-    assert dev1.data.div == 5
-    assert dev2.data.div == 0
+    assert [c.en for c in chans] == [True, True, False]
+    assert [c.div for c in chans] == [1, 5, 0]
 
     # wait for data
     data = q0.get(block=True, timeout=0.5)
@@ -205,54 +237,38 @@ def test_nxscope_channels_runtime():
     data = q1.get(block=True, timeout=0.5)
     assert data
     with pytest.raises(queue.Empty):
-        _ = q2.get(block=True, timeout=0.5)
+        _ = q2.get(block=True, timeout=EMPTY_WAIT)
 
     # reconfig
+    nxscope.ch_divider(0, 0)
+    nxscope.ch_enable(1)
+    nxscope.ch_divider(1, 10)
     nxscope.ch_disable(0, writenow=True)
-    nxscope.ch_divider(0, 0, writenow=True)
-    nxscope.ch_enable(1, writenow=True)
-    nxscope.ch_divider(1, 10, writenow=True)
 
-    assert dev0.data.en is False
-    assert dev1.data.en is True
-    assert dev2.data.en is False
-    assert dev0.data.div == 0
-    assert dev1.data.div == 10
-    assert dev2.data.div == 0
+    assert [c.en for c in chans] == [False, True, False]
+    assert [c.div for c in chans] == [0, 10, 0]
 
-    nxscope.ch_enable(0, writenow=True)
-    nxscope.ch_divider(0, 5, writenow=True)
-    nxscope.ch_enable(1, writenow=True)
-    nxscope.ch_divider(1, 5, writenow=True)
-    nxscope.ch_enable(2, writenow=True)
-    nxscope.ch_divider(2, 5, writenow=True)
+    nxscope.ch_enable([0, 1, 2])
+    nxscope.ch_divider([0, 1, 2], 5, writenow=True)
 
-    assert dev0.data.en is True
-    assert dev1.data.en is True
-    assert dev2.data.en is True
-    assert dev0.data.div == 5
-    assert dev1.data.div == 5
-    assert dev2.data.div == 5
+    assert [c.en for c in chans] == [True, True, True]
+    assert [c.div for c in chans] == [5, 5, 5]
 
     # get more data
     for _ in range(100):
-        _ = q0.get(block=True, timeout=1)
-        _ = q1.get(block=True, timeout=1)
-        _ = q2.get(block=True, timeout=1)
+        _ = q0.get(timeout=DATA_WAIT)
+        _ = q1.get(timeout=DATA_WAIT)
+        _ = q2.get(timeout=DATA_WAIT)
 
     # configuration not written
     nxscope.ch_disable_all()
 
-    assert dev0.data.en is True
-    assert dev1.data.en is True
-    assert dev2.data.en is True
+    assert [c.en for c in chans] == [True, True, True]
 
     # configuration written
     nxscope.ch_disable_all(True)
 
-    assert dev0.data.en is False
-    assert dev1.data.en is False
-    assert dev2.data.en is False
+    assert [c.en for c in chans] == [False, False, False]
 
     # stop stream
     nxscope.stream_stop()
@@ -261,78 +277,59 @@ def test_nxscope_channels_runtime():
     nxscope.stream_unsub(q1)
     nxscope.stream_unsub(q2)
 
-    # disconnect
-    nxscope.disconnect()
-
-
-stream_started = threading.Event()
-stream_stop = threading.Event()
-
 
-def thread1(nxscope, inst):
+def thread1(nxscope, stream_started, stream_done):
     # wait for stream started
-    stream_started.wait()
+    assert stream_started.wait(5)
 
-    # get device handlers
-    dev0 = nxscope.dev_channel_get(0)
-    dev1 = nxscope.dev_channel_get(1)
-    dev2 = nxscope.dev_channel_get(2)
+    # channel data is updated in place, bind it once
+    chans = [nxscope.dev_channel_get(ch).data for ch in range(3)]
 
     # make sure that channels enabled
-    nxscope.ch_enable(0)
-    nxscope.ch_enable(1)
-    nxscope.ch_enable(2)
+    nxscope.ch_enable([0, 1, 2])
     nxscope.channels_write()
 
-    assert dev0.data.en is True
-    assert dev1.data.en is True
-    assert dev2.data.en is True
+    assert [c.en for c in chans] == [True, True, True]
 
     # subscribe to streams
     q0 = nxscope.stream_sub(0)
     q1 = nxscope.stream_sub(1)
     q2 = nxscope.stream_sub(2)
 
-    # wait for stop request
-    while not stream_stop.is_set():
-        _ = q0.get(block=True, timeout=0.5)
-        _ = q1.get(block=True, timeout=0.5)
-        _ = q2.get(block=True, timeout=0.5)
+    # get data, the stream runs until all threads are done
+    for _ in range(100):
+        _ = q0.get(timeout=DATA_WAIT)
+        _ = q1.get(timeout=DATA_WAIT)
+        _ = q2.get(timeout=DATA_WAIT)
+    stream_done.wait()
 
     nxscope.stream_unsub(q0)
     nxscope.stream_unsub(q1)
     nxscope.stream_unsub(q2)
 
 
-def test_nxscope_channels_thread():
-    intf = DummyDev()
-    parse = Parser()
-    nxscope = NxscopeHandler(intf, parse)
-
-    thr1 = threading.Thread(target=thread1, args=[nxscope, 1])
-    thr1.start()
-    thr2 = threading.Thread(target=thread1, args=[nxscope, 2])
-    thr2.start()
-    thr3 = threading.Thread(target=thread1, args=[nxscope, 3])
-    thr3.start()
-
-    # connect
-    nxscope.connect()
-
-    # force default state
-    nxscope.channels_default_cfg(writenow=True)
-
-    # get device handlers
-    dev0 = nxscope.dev_channel_get(0)
-    dev1 = nxscope.dev_channel_get(1)
-    dev2 = nxscope.dev_channel_get(2)
-
-    assert dev0.data.en is False
-    assert dev1.data.en is False
-    assert dev2.data.en is False
-    assert dev0.data.div == 0
-    assert dev1.data.div == 0
-    assert dev2.data.div == 0
+@pytest.mark.parametrize(
+    "nthreads", [1, pytest.param(3, marks=pytest.mark.slow)]
+)
+def test_nxscope_channels_thread(nxscope, nthreads):
+    stream_started = threading.Event()
+    # the test and all threads meet here before the stream stops,
+    # timeout so a failed thread can't hang the test
+    stream_done = threading.Barrier(nthreads + 1, timeout=5)
+    args = [nxscope, stream_started, stream_done]
+    threads = [
+        # daemon, a stuck worker can't keep the test run alive
+        threading.Thread(target=thread1, args=args, daemon=True)
+        for _ in range(nthreads)
+    ]
+    for thr in threads:
+        thr.start()
+
+    # channel data is updated in place, bind it once
+    chans = [nxscope.dev_channel_get(ch).data for ch in range(3)]
+
+    assert [c.en for c in chans] == [False, False, False]
+    assert [c.div for c in chans] == [0, 0, 0]
 
     # subscribe to streams
     q0 = nxscope.stream_sub(0)
@@ -342,17 +339,13 @@ def test_nxscope_channels_thread():
     nxscope.channels_default_cfg(writenow=True)
 
     # configure channels
-    nxscope.ch_enable(0)
-    nxscope.ch_enable(1)
-    nxscope.ch_enable(2)
+    nxscope.ch_enable([0, 1, 2])
     nxscope.ch_divider(1, 1)
     nxscope.ch_divider(2, 2)
     nxscope.ch_divider(3, 3)
     nxscope.channels_write()
 
-    assert dev0.data.en is True
-    assert dev1.data.en is True
-    assert dev2.data.en is True
+    assert [c.en for c in chans] == [True, True, True]
 
     # start stream without channels configured
     nxscope.stream_start()
@@ -360,14 +353,12 @@ def test_nxscope_channels_thread():
 
     # get more data
     for _ in range(100):
-        _ = q0.get(block=True, timeout=0.5)
-        _ = q1.get(block=True, timeout=0.5)
-        _ = q2.get(block=True, timeout=0.5)
-
-    # stop threads
-    stream_stop.set()
+        _ = q0.get(timeout=DATA_WAIT)
+        _ = q1.get(timeout=DATA_WAIT)
+        _ = q2.get(timeout=DATA_WAIT)
 
-    # stop stream
+    # wait for threads, then stop stream
+    stream_done.wait()
     nxscope.stream_stop()
 
     nxscope.stream_unsub(q0)
@@ -375,9 +366,5 @@ def test_nxscope_channels_thread():
     nxscope.stream_unsub(q2)
 
     # wait for threads
-    thr1.join()
-    thr2.join()
-    thr3.join()
-
-    # disconnect
-    nxscope.disconnect()
+    for thr in threads:
+        thr.join()
@@ -1,40 +1,42 @@
 import threading
+import time
 
 import pytest  # type: ignore
 
 from nxslib.thread import ThreadCommon
 
-thread_flag = threading.Event()
-init_flag = threading.Event()
-final_flag = threading.Event()
 
+@pytest.fixture
+def thread_flag():
+    return threading.Event()
 
-# clear flags at the beginning of all tests
-@pytest.fixture(autouse=True)
-def init_flags():
-    thread_flag.clear()
-    init_flag.clear()
-    final_flag.clear()
 
+@pytest.fixture
+def init_flag():
+    return threading.Event()
 
-def thread():
-    thread_flag.set()
 
+@pytest.fixture
+def final_flag():
+    return threading.Event()
 
-def init():
-    init_flag.set()
 
+@pytest.fixture
+def thread(thread_flag):
+    def target():
+        # called in a busy loop, is_set() is a plain read while set() locks
+        if not thread_flag.is_set():
+            thread_flag.set()
 
-def final():
-    final_flag.set()
+    return target
 
 
-def test_thread():
+def test_thread(thread, thread_flag, init_flag, final_flag):
     # invalid thread type
-    with pytest.raises(AssertionError):
+    with pytest.raises(TypeError):
         thr = ThreadCommon(None)
 
-    with pytest.raises(AssertionError):
+    with pytest.raises(TypeError):
         thr = ThreadCommon(1)
 
     # valid thread type
@@ -85,17 +87,17 @@ def test_thread():
     assert thr.thread_is_alive() is False
 
 
-def test_thread_init_final():
+def test_thread_init_final(thread, thread_flag, init_flag, final_flag):
     # invalid init type
-    with pytest.raises(AssertionError):
+    with pytest.raises(TypeError):
         thr = ThreadCommon(thread, init="foo")
 
     # invalid final type
-    with pytest.raises(AssertionError):
+    with pytest.raises(TypeError):
         thr = ThreadCommon(thread, final="foo")
 
     # valid thread init and final
-    thr = ThreadCommon(thread, init=init, final=final)
+    thr = ThreadCommon(thread, init=init_flag.set, final=final_flag.set)
     assert isinstance(thr, ThreadCommon)
 
     # not started
@@ -141,3 +143,65 @@ def test_thread_init_final():
     assert thr.thread_is_alive() is False
     thr.thread_stop()
     assert thr.thread_is_alive() is False
+
+
+def test_thread_idle_period(thread, thread_flag):
+    # valid thread with idle period
+    thr = ThreadCommon(thread, idle_period=10.0)
+    assert isinstance(thr, ThreadCommon)
+
+    # start thread
+    thr.thread_start()
+    assert thr.thread_is_alive() is True
+
+    # stop request interrupts idle wait
+    thr.thread_stop()
+    assert thr.thread_is_alive() is False
+
+    # target not called before the first idle period elapsed
+    assert thread_flag.is_set() is False
+
+    # short idle period
+    thr = ThreadCommon(thread, idle_period=0.001)
+    thr.thread_start()
+    assert thread_flag.wait(0.5)
+    thr.thread_stop()
+    assert thr.thread_is_alive() is False
+
+
+def backoff_gaps(results, idle_threshold, idle_backoff=0.1):
+    times = []
+    done = threading.Event()
+
+    def target():
+        times.append(time.monotonic())
+        if len(times) == len(results):
+            # stop from the thread itself, so all results are consumed
+            thr.stop_set()
+            done.set()
+        return results[len(times) - 1]
+
+    thr = ThreadCommon(
+        target, idle_threshold=idle_threshold, idle_backoff=idle_backoff
+    )
+    thr.thread_start()
+    assert done.wait(5)
+    thr.thread_stop()
+    assert thr.thread_is_alive() is False
+
+    # True where the thread backed off between two calls
+    return [b - a >= idle_backoff * 0.9 for a, b in zip(times, times[1:])]
+
+
+def test_thread_idle_threshold():
+    # one backoff per idle_threshold consecutive calls without work
+    assert backoff_gaps([False] * 7, 2) == [False, True] * 3
+    assert backoff_gaps([False] * 7, 3) == [False, False, True] * 2
+
+    # work done resets the count
+    assert backoff_gaps([False, False, True] * 3, 3) == [False] * 8
+    assert backoff_gaps([False, False, None] * 3, 3) == [False] * 8
+
+    # never back off while target reports work
+    assert backoff_gaps([True] * 5, 1) == [False] * 4
+    assert backoff_gaps([None] * 5, 1) == [False] * 4